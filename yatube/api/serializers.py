@@ -0,0 +1,55 @@
+"""Сериализация записей в JSON через values(), без объектов моделей."""
+from posts.models import Post
+
+# Поле API -> поле для values().
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated': 'updated',
+    'author': 'author__username',
+    'group': 'group__slug',
+    'image': 'image',
+}
+GROUP_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'description': 'description',
+    'posts_count': 'posts_count',
+}
+# Ключ курсора ленты, он нужен всегда, даже если не запрошен.
+CURSOR_FIELDS = ('pub_date', 'id')
+
+
+class FieldError(ValueError):
+    pass
+
+
+def select_fields(request, available):
+    """Поля из `?fields=a,b`; без параметра — все доступные."""
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(available)
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise FieldError(f'Неизвестные поля: {", ".join(unknown)}')
+    return fields
+
+
+def image_url(name):
+    if not name:
+        return None
+    return Post._meta.get_field('image').storage.url(name)
+
+
+def serialize(rows, fields, available):
+    """Переименовывает ключи строк values() в имена полей API."""
+    result = []
+    for row in rows:
+        item = {name: row[available[name]] for name in fields}
+        if 'image' in item:
+            item['image'] = image_url(item['image'])
+        result.append(item)
+    return result
@@ -0,0 +1,175 @@
+import base64
+import gzip
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+def basic(username, password):
+    token = base64.b64encode(f'{username}:{password}'.encode()).decode()
+    return f'Basic {token}'
+
+
+@override_settings(API_PAGE_SIZE=5, API_MAX_PAGE_SIZE=10)
+class ApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(
+            username='api_user', password='secret-pass'
+        )
+        cls.other = User.objects.create_user(
+            username='api_other', password='secret-pass'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Текст {i}', author=cls.post_author, group=cls.group)
+            for i in range(12)
+        )
+        cls.post = Post.objects.latest('pub_date', 'id')
+
+    def setUp(self):
+        # Лимиты запросов хранятся в кеше и не должны переходить между
+        # тестами.
+        cache.clear()
+        self.guest_client = Client()
+        self.author_auth = basic(self.post_author.username, 'secret-pass')
+        self.other_auth = basic(self.other.username, 'secret-pass')
+
+    def get_json(self, path, **params):
+        response = self.guest_client.get(path, params)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response, json.loads(response.content)
+
+    def send(self, method, path, data, **extra):
+        return getattr(self.guest_client, method)(
+            path, json.dumps(data), content_type='application/json', **extra
+        )
+
+    def test_cursor_pages_cover_feed(self):
+        path = reverse('api:posts')
+        seen = []
+        with self.assertNumQueries(1):
+            response, page = self.get_json(path)
+        while True:
+            seen += [item['id'] for item in page['results']]
+            if not page['next']:
+                break
+            response, page = self.get_json(page['next'])
+        self.assertEqual(
+            seen,
+            list(Post.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )),
+        )
+
+    def test_fields_and_limit(self):
+        _, page = self.get_json(
+            reverse('api:posts'), fields='id,author', limit=50
+        )
+        self.assertEqual(len(page['results']), 10)
+        self.assertEqual(
+            page['results'][0],
+            {'id': self.post.pk, 'author': self.post_author.username},
+        )
+        response, body = self.get_json(reverse('api:posts'), fields='secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', body['error'])
+        # 'broken' и {"v": [{}, 1], "r": 0} — значения курсора не строки.
+        for cursor in ('broken', 'eyJ2Ijpbe30sMV0sInIiOjB9'):
+            with self.subTest(cursor=cursor):
+                response, _ = self.get_json(
+                    reverse('api:posts'), cursor=cursor
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_group_and_profile_endpoints(self):
+        _, group = self.get_json(
+            reverse('api:group_detail', args=[self.group.slug])
+        )
+        self.assertEqual(group['posts_count'], 12)
+        _, groups = self.get_json(reverse('api:groups'), fields='slug')
+        self.assertEqual(groups['results'], [{'slug': self.group.slug}])
+        _, posts = self.get_json(
+            reverse('api:group_posts', args=[self.group.slug]), fields='group'
+        )
+        self.assertEqual(posts['results'][0], {'group': self.group.slug})
+        _, profile = self.get_json(
+            reverse('api:profile', args=[self.post_author.username])
+        )
+        self.assertEqual(profile['posts_count'], 12)
+        _, posts = self.get_json(
+            reverse('api:profile_posts', args=[self.other.username])
+        )
+        self.assertEqual(posts, {'results': [], 'next': None})
+        response, body = self.get_json(reverse('api:group_detail', args=['x']))
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('error', body)
+
+    def test_responses_are_gzipped(self):
+        response = self.guest_client.get(
+            reverse('api:posts'), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        page = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(page['results']), 5)
+
+    def test_create_post(self):
+        path = reverse('api:posts')
+        response = self.send('post', path, {'text': 'Новая запись'})
+        self.assertEqual(response.status_code, 401)
+        response = self.send(
+            'post', path, {'text': 'Новая запись', 'group': self.group.slug},
+            HTTP_AUTHORIZATION=self.other_auth,
+        )
+        self.assertEqual(response.status_code, 201)
+        created = json.loads(response.content)
+        post = Post.objects.get(pk=created['id'])
+        self.assertEqual(post.author, self.other)
+        self.assertEqual(post.group, self.group)
+        self.assertEqual(created['author'], self.other.username)
+        response = self.send(
+            'post', path, {'text': '', 'group': 'missing'},
+            HTTP_AUTHORIZATION=self.other_auth,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(json.loads(response.content)['errors']), {'text', 'group'}
+        )
+
+    def test_edit_post(self):
+        path = reverse('api:post_detail', args=[self.post.pk])
+        response = self.send(
+            'patch', path, {'text': 'Чужая правка'},
+            HTTP_AUTHORIZATION=self.other_auth,
+        )
+        self.assertEqual(response.status_code, 403)
+        response = self.send(
+            'patch', path, {'text': 'Правка'},
+            HTTP_AUTHORIZATION=self.author_auth,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Правка')
+        self.assertEqual(self.post.group, self.group)
+
+    def test_session_requires_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.other)
+        response = client.post(
+            reverse('api:posts'),
+            json.dumps({'text': 'Запись'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,277 @@
+import base64
+import binascii
+import json
+import math
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import transaction
+from django.http import JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET, require_http_methods
+
+from core import ratelimit
+from posts.forms import PostForm
+from posts.models import Group, Post, User
+from posts.paginator import InvalidCursor, decode_cursor, encode_cursor, seek
+
+from .serializers import (
+    CURSOR_FIELDS, GROUP_FIELDS, POST_FIELDS, FieldError, select_fields,
+    serialize
+)
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data,
+        status=status,
+        json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')},
+    )
+
+
+def error(message, status=400, **extra):
+    return json_response({'error': message, **extra}, status)
+
+
+class Throttled(Exception):
+    def __init__(self, wait):
+        super().__init__(wait)
+        self.wait = wait
+
+
+def throttled(wait):
+    retry_after = math.ceil(wait)
+    response = error('Слишком много запросов', 429, retry_after=retry_after)
+    response['Retry-After'] = retry_after
+    return response
+
+
+def api_user(request):
+    """Пользователь запроса на запись.
+
+    Клиенты без браузера передают логин и пароль в заголовке
+    `Authorization: Basic`. Каждая такая попытка списывается с лимита
+    входа для IP, как на странице входа, иначе через API можно было бы
+    подбирать пароли; при исчерпанном лимите поднимается Throttled.
+    Для сессии браузера CSRF проверяется так же, как в обычных формах,
+    иначе чужой сайт мог бы писать от имени вошедшего пользователя.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Basic '):
+        wait = ratelimit.check(request, 'login', ratelimit.ip_id(request))
+        if wait:
+            raise Throttled(wait)
+        try:
+            username, password = base64.b64decode(
+                header[6:]
+            ).decode().split(':', 1)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+        return authenticate(request, username=username, password=password)
+    if not request.user.is_authenticated:
+        return None
+    if CsrfViewMiddleware().process_view(request, None, (), {}):
+        return None
+    return request.user
+
+
+def authorize(request, scope):
+    """Ставит request.user для записи; ответ с ошибкой или None.
+
+    Запрос вошедшего пользователя списывается с лимита `scope`.
+    """
+    try:
+        user = api_user(request)
+    except Throttled as limit:
+        return throttled(limit.wait)
+    if user is None:
+        return error('Нужна авторизация', 401)
+    request.user = user
+    wait = ratelimit.check(request, scope)
+    if wait:
+        return throttled(wait)
+    return None
+
+
+def paginate(request, queryset, available, cursor_fields):
+    """Страница ленты по курсору: список значений, без объектов моделей.
+
+    Поля курсора выбираются всегда, даже если клиент их не запросил,
+    и курсор на следующую страницу собирается из последней строки.
+    """
+    fields = select_fields(request, available)
+    try:
+        limit = min(
+            int(request.GET.get('limit', settings.API_PAGE_SIZE)),
+            settings.API_MAX_PAGE_SIZE,
+        )
+        values, reverse = decode_cursor(
+            request.GET.get('cursor'), queryset.model, cursor_fields
+        )
+    except (ValueError, InvalidCursor):
+        raise FieldError('Неверный limit или cursor')
+    if reverse or limit < 1:
+        raise FieldError('Неверный limit или cursor')
+    queryset = queryset.order_by(*(f'-{name}' for name in cursor_fields))
+    if values is not None:
+        queryset = seek(queryset, cursor_fields, values)
+    columns = {available[name] for name in fields} | set(cursor_fields)
+    rows = list(queryset.values(*columns)[:limit + 1])
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        query = request.GET.copy()
+        query['cursor'] = encode_cursor(
+            [rows[-1][name] for name in cursor_fields]
+        )
+        next_url = f'{request.path}?{query.urlencode()}'
+    return {'results': serialize(rows, fields, available), 'next': next_url}
+
+
+def post_list(request, queryset):
+    try:
+        return json_response(
+            paginate(request, queryset, POST_FIELDS, CURSOR_FIELDS)
+        )
+    except FieldError as problem:
+        return error(str(problem))
+
+
+def post_item(request, post_id, status=200):
+    try:
+        fields = select_fields(request, POST_FIELDS)
+    except FieldError as problem:
+        return error(str(problem))
+    rows = Post.objects.filter(pk=post_id).values(
+        *(POST_FIELDS[name] for name in fields)
+    )
+    if not rows:
+        return error('Запись не найдена', 404)
+    return json_response(serialize(rows, fields, POST_FIELDS)[0], status)
+
+
+def save_post(request, instance=None):
+    """Создаёт или меняет запись через PostForm, как HTML-формы."""
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return error('Тело запроса должно быть JSON')
+    if not isinstance(data, dict):
+        return error('Тело запроса должно быть JSON-объектом')
+    form_data = {}
+    if instance is not None:
+        form_data = {'text': instance.text, 'group': instance.group_id}
+    if 'text' in data:
+        form_data['text'] = data['text']
+    if data.get('group'):
+        form_data['group'] = Group.objects.filter(
+            slug=data['group']
+        ).values_list('id', flat=True).first() or -1
+    elif 'group' in data:
+        form_data['group'] = None
+    form = PostForm(form_data, instance=instance)
+    if not form.is_valid():
+        return error('Неверные данные', errors=form.errors)
+    with transaction.atomic():
+        post = form.save(commit=False)
+        if instance is None:
+            post.author = request.user
+        post.save()
+    return post_item(request, post.pk, 201 if instance is None else 200)
+
+
+@csrf_exempt
+@gzip_page
+@require_http_methods(['GET', 'POST'])
+def posts(request):
+    if request.method == 'GET':
+        return post_list(request, Post.objects.all())
+    response = authorize(request, 'post_create')
+    if response is not None:
+        return response
+    return save_post(request)
+
+
+@csrf_exempt
+@gzip_page
+@require_http_methods(['GET', 'PATCH', 'PUT'])
+def post_detail(request, post_id):
+    if request.method == 'GET':
+        return post_item(request, post_id)
+    response = authorize(request, 'post_edit')
+    if response is not None:
+        return response
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None:
+        return error('Запись не найдена', 404)
+    if post.author_id != request.user.pk:
+        return error('Менять запись может только автор', 403)
+    return save_post(request, post)
+
+
+@gzip_page
+@require_GET
+def groups(request):
+    try:
+        return json_response(
+            paginate(request, Group.objects.all(), GROUP_FIELDS, ('id',))
+        )
+    except FieldError as problem:
+        return error(str(problem))
+
+
+@gzip_page
+@require_GET
+def group_detail(request, slug):
+    try:
+        fields = select_fields(request, GROUP_FIELDS)
+    except FieldError as problem:
+        return error(str(problem))
+    rows = Group.objects.filter(slug=slug).values(
+        *(GROUP_FIELDS[name] for name in fields)
+    )
+    if not rows:
+        return error('Группа не найдена', 404)
+    return json_response(serialize(rows, fields, GROUP_FIELDS)[0])
+
+
+@gzip_page
+@require_GET
+def group_posts(request, slug):
+    group_id = Group.objects.filter(slug=slug).values_list(
+        'id', flat=True
+    ).first()
+    if group_id is None:
+        return error('Группа не найдена', 404)
+    return post_list(request, Post.objects.filter(group_id=group_id))
+
+
+@gzip_page
+@require_GET
+def profile(request, username):
+    author = User.objects.filter(username=username).values(
+        'username', 'first_name', 'last_name',
+        'post_stats__posts_count', 'post_stats__followers_count',
+    ).first()
+    if author is None:
+        return error('Пользователь не найден', 404)
+    return json_response({
+        'username': author['username'],
+        'first_name': author['first_name'],
+        'last_name': author['last_name'],
+        'posts_count': author['post_stats__posts_count'] or 0,
+        'followers_count': author['post_stats__followers_count'] or 0,
+    })
+
+
+@gzip_page
+@require_GET
+def profile_posts(request, username):
+    author_id = User.objects.filter(username=username).values_list(
+        'id', flat=True
+    ).first()
+    if author_id is None:
+        return error('Пользователь не найден', 404)
+    return post_list(request, Post.objects.filter(author_id=author_id))
@@ -0,0 +1,17 @@
+"""Redis в памяти процесса для django-redis (YATUBE_CACHE=fakeredis)."""
+import fakeredis
+from redis import ConnectionPool
+
+
+class FakeRedisConnectionPool(ConnectionPool):
+    """Пул django-redis, чьи соединения ведут в fakeredis, а не на сервер.
+
+    Команды и их поведение (INCR, TTL, SET NX) те же, что у Redis, так
+    что кеш лент проверяется на Redis-бэкенде без запущенного сервера.
+    Данные общие для всех соединений с одним адресом в LOCATION. Пакет
+    lupa нужен потому, что django-redis делает incr Lua-скриптом.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['connection_class'] = fakeredis.FakeConnection
+        super().__init__(**kwargs)
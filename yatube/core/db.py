@@ -0,0 +1,28 @@
+"""Настройка новых соединений с базой."""
+from django.conf import settings
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """Выполняет SQLITE_PRAGMAS на каждом новом соединении с SQLite.
+
+    journal_mode хранится в самом файле базы, остальные PRAGMA живут
+    только в соединении, поэтому их нужно повторять при подключении.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    # Напрямую через sqlite3: эти запросы не нужны в connection.queries
+    # и в подсчётах assertNumQueries.
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+def pragmas(connection):
+    """Текущие значения SQLITE_PRAGMAS, как их видит соединение."""
+    if connection.vendor != 'sqlite':
+        return {}
+    values = {}
+    with connection.cursor() as cursor:
+        for name in settings.SQLITE_PRAGMAS:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    return values
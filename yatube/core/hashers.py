@@ -0,0 +1,179 @@
+"""Хешеры паролей с параметрами из настроек и общим пулом потоков.
+
+Профиль (PASSWORD_HASHER_PROFILE) выбирает, каким хешером сохранять
+новые пароли; остальные остаются в PASSWORD_HASHERS, чтобы проверять
+старые хеши. При входе Django сам пересохраняет пароль, если хеш
+сделан другим алгоритмом или с другими параметрами (`must_update`),
+так что смена профиля или параметров доходит до пользователей
+постепенно, без сброса паролей.
+
+Хеширование занимает десятки миллисекунд процессора и отпускает GIL
+(hashlib, argon2-cffi), поэтому выполняется в отдельном пуле: не больше
+PASSWORD_HASHING_THREADS хешей одновременно, даже если вход штурмуют
+все воркеры, — остальные потоки продолжают отдавать ленты. Если пул и
+очередь заняты, место ждётся лишь PASSWORD_HASHING_TIMEOUT (доли
+секунды), затем поднимается HashingBusy, и HashingBusyMiddleware сразу
+отвечает 503: воркер не простаивает в ожидании.
+"""
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+_lock = threading.Lock()
+_local = threading.local()
+_pool = None
+
+
+class HashingBusy(Exception):
+    """Пул хеширования занят дольше PASSWORD_HASHING_TIMEOUT."""
+
+
+def pool():
+    """Семафор мест и пул потоков под текущие настройки."""
+    global _pool
+    size = (settings.PASSWORD_HASHING_THREADS, settings.PASSWORD_HASHING_QUEUE)
+    with _lock:
+        if _pool is None or _pool[0] != size:
+            if _pool is not None:
+                _pool[2].shutdown(wait=False)
+            threads, queue = size
+            _pool = (
+                size,
+                threading.BoundedSemaphore(threads + queue),
+                ThreadPoolExecutor(threads, thread_name_prefix='hashing'),
+            )
+        return _pool[1], _pool[2]
+
+
+def run(func, *args):
+    _local.inside = True
+    try:
+        return func(*args)
+    finally:
+        _local.inside = False
+
+
+def offload(func, *args):
+    """Выполняет func в пуле хеширования и ждёт результат.
+
+    Вложенные вызовы (verify вызывает encode) выполняются на месте,
+    иначе поток пула ждал бы сам себя.
+    """
+    if not settings.PASSWORD_HASHING_THREADS or getattr(
+        _local, 'inside', False
+    ):
+        return func(*args)
+    slots, executor = pool()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+        raise HashingBusy
+    try:
+        return executor.submit(run, func, *args).result()
+    finally:
+        slots.release()
+
+
+class PooledMixin:
+    def encode(self, password, salt, *args):
+        return offload(super().encode, password, salt, *args)
+
+    def verify(self, password, encoded):
+        return offload(super().verify, password, encoded)
+
+    def harden_runtime(self, password, encoded):
+        return offload(super().harden_runtime, password, encoded)
+
+
+class PBKDF2PasswordHasher(PooledMixin, hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class Argon2PasswordHasher(PooledMixin, hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2['time_cost']
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2['memory_cost']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2['parallelism']
+
+
+class BaseScryptPasswordHasher(hashers.BasePasswordHasher):
+    """scrypt из hashlib; формат хеша тот же, что у хешера Django 4.0.
+
+    Хеш: `scrypt$N$соль$r$p$хеш`, где N — work_factor, r — block_size,
+    p — parallelism.
+    """
+    algorithm = 'scrypt'
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT['work_factor']
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT['block_size']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT['parallelism']
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash = hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+            # Сколько памяти нужно OpenSSL для этих N, r и p.
+            maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+            dklen=64,
+        )
+        hash = base64.b64encode(hash).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash)
+
+    @staticmethod
+    def decode(encoded):
+        algorithm, n, salt, r, p, hash = encoded.split('$', 5)
+        return algorithm, int(n), salt, int(r), int(p), hash
+
+    def verify(self, password, encoded):
+        algorithm, n, salt, r, p, hash = self.decode(encoded)
+        assert algorithm == self.algorithm
+        return constant_time_compare(
+            encoded, self.encode(password, salt, n, r, p)
+        )
+
+    def safe_summary(self, encoded):
+        algorithm, n, salt, r, p, hash = self.decode(encoded)
+        return OrderedDict([
+            (_('algorithm'), algorithm),
+            (_('work factor'), n),
+            (_('block size'), r),
+            (_('parallelism'), p),
+            (_('salt'), hashers.mask_hash(salt)),
+            (_('hash'), hashers.mask_hash(hash)),
+        ])
+
+    def must_update(self, encoded):
+        algorithm, n, salt, r, p, hash = self.decode(encoded)
+        return (n, r, p) != (
+            self.work_factor, self.block_size, self.parallelism
+        )
+
+
+class ScryptPasswordHasher(PooledMixin, BaseScryptPasswordHasher):
+    pass
@@ -0,0 +1,95 @@
+"""Замеры SQL-запросов и отрисовки шаблонов в текущем потоке."""
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.template.backends.django import Template
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+def _install():
+    """Оборачивает `Template.render` бэкенда DjangoTemplates один раз.
+
+    Оборачивается именно бэкенд, а не `django.template.base.Template`:
+    тестовое окружение Django подменяет `_render` базового шаблона,
+    и замеры в тестах тогда пропадали бы.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        original = Template.render
+
+        def render(self, context=None, request=None):
+            timings = getattr(_local, 'templates', None)
+            if timings is None:
+                return original(self, context, request)
+            start = time.perf_counter()
+            try:
+                return original(self, context, request)
+            finally:
+                timings.append(
+                    (self.origin.template_name, time.perf_counter() - start)
+                )
+
+        Template.render = render
+        _installed = True
+
+
+@contextmanager
+def record_templates():
+    """Копит пары (имя шаблона, секунды) для шаблонов верхнего уровня."""
+    _install()
+    timings = []
+    previous = getattr(_local, 'templates', None)
+    _local.templates = timings
+    try:
+        yield timings
+    finally:
+        _local.templates = previous
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((
+                context['connection'].alias,
+                sql,
+                params,
+                time.perf_counter() - start,
+            ))
+
+    @property
+    def total_time(self):
+        return sum(duration for *_, duration in self.queries)
+
+    def duplicates(self):
+        """Сколько запросов повторили уже выполненный с теми же параметрами."""
+        seen = set()
+        repeated = 0
+        for alias, sql, params, _ in self.queries:
+            key = (alias, sql, repr(params))
+            if key in seen:
+                repeated += 1
+            seen.add(key)
+        return repeated
+
+
+@contextmanager
+def record_queries():
+    """Копит запросы ко всем базам: (alias, sql, params, секунды)."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
@@ -0,0 +1,121 @@
+import importlib.util
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from core.hashers import HashingBusy
+
+PASSWORD = 'bench-password-42'
+
+
+def hashers_for(profile):
+    """PASSWORD_HASHERS, в которых профиль `profile` главный."""
+    main = settings.PASSWORD_HASHER_CLASSES[profile]
+    return [main] + [
+        path for path in settings.PASSWORD_HASHERS if path != main
+    ]
+
+
+def login(encoded):
+    try:
+        assert check_password(PASSWORD, encoded)
+    except HashingBusy:
+        return False
+    return True
+
+
+def logins_per_second(encoded, count, threads):
+    """Успешных проверок пароля в секунду при `threads` одновременных
+    входах и сколько входов получили бы 503 из-за занятого пула.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(login, [encoded] * count))
+    elapsed = time.perf_counter() - start
+    return sum(results) / elapsed, results.count(False)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет проверку пароля для профилей хешеров: входов в секунду '
+        'на одно ядро и при одновременных входах — через пул хеширования '
+        'и без него. С --target-ms подсказывает параметры профиля под '
+        'нужное время одной проверки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', default=settings.PASSWORD_HASHER_PROFILE,
+            help='Профили через запятую: pbkdf2, scrypt, argon2.',
+        )
+        parser.add_argument(
+            '--logins', type=int, default=20,
+            help='Сколько проверок пароля делать в каждом замере.',
+        )
+        parser.add_argument(
+            '--threads', default=str(os.cpu_count() or 1),
+            help='Одновременных входов через запятую.',
+        )
+        parser.add_argument(
+            '--target-ms', type=float,
+            help='Желаемое время одной проверки на ядро, мс.',
+        )
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'].split(',')
+        for profile in profiles:
+            if profile not in settings.PASSWORD_HASHER_CLASSES:
+                raise CommandError(f'Неизвестный профиль {profile}.')
+            if profile == 'argon2' and not importlib.util.find_spec('argon2'):
+                raise CommandError('Для argon2 нужен пакет argon2-cffi.')
+        threads = [int(count) for count in options['threads'].split(',')]
+        self.stdout.write(
+            f'Потоков в пуле хеширования: {settings.PASSWORD_HASHING_THREADS}'
+        )
+        for profile in profiles:
+            with override_settings(PASSWORD_HASHERS=hashers_for(profile)):
+                self.measure(profile, threads, options)
+
+    def measure(self, profile, threads, options):
+        encoded = make_password(PASSWORD)
+        single, _ = logins_per_second(encoded, options['logins'], 1)
+        self.stdout.write(
+            f'{profile}: {encoded.split("$", 1)[0]}, '
+            f'{1000 / single:.1f} мс на вход, {single:.1f} входов/с на ядро'
+        )
+        for count in threads:
+            pooled, rejected = logins_per_second(
+                encoded, options['logins'], count
+            )
+            with override_settings(PASSWORD_HASHING_THREADS=0):
+                inline, _ = logins_per_second(
+                    encoded, options['logins'], count
+                )
+            self.stdout.write(
+                f'  {count} одновременно: {pooled:.1f} входов/с через пул '
+                f'(503: {rejected}), {inline:.1f} без пула'
+            )
+        if options['target_ms']:
+            ratio = options['target_ms'] * single / 1000
+            self.stdout.write(f'  под {options["target_ms"]} мс: ' + suggest(
+                profile, ratio
+            ))
+
+
+def suggest(profile, ratio):
+    """Параметры профиля, при которых проверка займёт в ratio раз дольше."""
+    if profile == 'pbkdf2':
+        iterations = int(settings.PASSWORD_PBKDF2_ITERATIONS * ratio)
+        return f'PASSWORD_PBKDF2_ITERATIONS = {iterations}'
+    if profile == 'scrypt':
+        # N обязан быть степенью двойки.
+        work_factor = settings.PASSWORD_SCRYPT['work_factor'] * ratio
+        power = max(1, round(work_factor).bit_length() - 1)
+        return f"PASSWORD_SCRYPT['work_factor'] = 2 ** {power}"
+    time_cost = max(1, round(settings.PASSWORD_ARGON2['time_cost'] * ratio))
+    return f"PASSWORD_ARGON2['time_cost'] = {time_cost}"
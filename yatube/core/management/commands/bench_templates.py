@@ -0,0 +1,136 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template import Engine, RequestContext, engines
+from django.test import RequestFactory
+
+from core.warmup import template_names
+from posts.benchmark import seed_posts, timed
+from posts.forms import PostForm
+from posts.models import Group, Post
+
+DIRECTORIES = ('posts', 'users', 'about', 'core', 'includes')
+UNCACHED_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def make_engine(engine, cached):
+    """Копия движка проекта с кешированием шаблонов или без него."""
+    loaders = UNCACHED_LOADERS
+    if cached:
+        loaders = [('django.template.loaders.cached.Loader', loaders)]
+    return Engine(
+        dirs=engine.dirs,
+        context_processors=engine.context_processors,
+        libraries=engine.libraries,
+        loaders=loaders,
+    )
+
+
+def sample_context():
+    """Контекст, которого хватает всем шаблонам: лента, запись, форма."""
+    feed = Post.objects.feed()
+    posts = list(feed[:10])
+    post = posts[0] if posts else None
+    return {
+        'page_obj': Paginator(posts, 10).get_page(1),
+        'post': post,
+        'posts': post,
+        'author': post.author if post else None,
+        'group': Group.objects.first(),
+        'form': PostForm(),
+        'post_count': len(posts),
+        'title': 'Замер',
+        'query': 'пост',
+    }
+
+
+def median(func, repeat):
+    """Медиана из posts.benchmark.timed, округлённая для отчёта."""
+    return round(timed(func, repeat)[0], 3)
+
+
+class Command(BaseCommand):
+    help = (
+        'Для каждого шаблона posts, users, about, core и includes '
+        'замеряет разбор исходника, отрисовку без кеша шаблонов (как '
+        'при DEBUG) и отрисовку уже скомпилированного шаблона.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, default=0,
+            help='Сколько записей добавить перед замером.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=50,
+            help='Сколько раз повторить каждый замер.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Записать отчёт в JSON-файл.',
+        )
+
+    def handle(self, *args, **options):
+        if options['posts']:
+            seed_posts(options['posts'])
+        engine = engines['django'].engine
+        uncached = make_engine(engine, cached=False)
+        cached = make_engine(engine, cached=True)
+        request = RequestFactory().get('/')
+        context = sample_context()
+        author = context['author']
+        request.user = author if author else AnonymousUser()
+        report = []
+        for name in template_names(engine.dirs):
+            if name.split('/')[0] not in DIRECTORIES:
+                continue
+            try:
+                report.append(self.measure(
+                    name, uncached, cached, request, context,
+                    options['repeat'],
+                ))
+            except Exception as error:
+                report.append({'template': name, 'error': repr(error)})
+        for entry in report:
+            if 'error' in entry:
+                self.stdout.write(self.style.ERROR(
+                    f'{entry["template"]}: {entry["error"]}'
+                ))
+                continue
+            self.stdout.write(
+                f'{entry["template"]:45} parse={entry["parse_ms"]:.3f}ms '
+                f'uncached={entry["uncached_ms"]:.3f}ms '
+                f'cached={entry["cached_ms"]:.3f}ms'
+            )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def measure(name, uncached, cached, request, context, repeat):
+        """Медианы трёх замеров для одного шаблона.
+
+        parse — только компиляция исходника самого шаблона; uncached —
+        чтение и разбор его, родителей и включаемых шаблонов плюс
+        отрисовка; cached — отрисовка после прогрева.
+        """
+        template, origin = uncached.find_template(name)
+        source = origin.loader.get_contents(origin)
+
+        def render(engine):
+            engine.get_template(name).render(RequestContext(request, context))
+
+        render(cached)
+        return {
+            'template': name,
+            'parse_ms': median(
+                lambda: Engine.from_string(uncached, source), repeat
+            ),
+            'uncached_ms': median(lambda: render(uncached), repeat),
+            'cached_ms': median(lambda: render(cached), repeat),
+        }
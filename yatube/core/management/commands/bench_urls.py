@@ -0,0 +1,171 @@
+import json
+import math
+import statistics
+import sys
+import time
+
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import get_resolver, reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from core.instrumentation import record_queries, record_templates
+from posts.benchmark import seed_posts
+from posts.models import Post
+
+NAMESPACES = ('posts', 'users', 'about')
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет каждый адрес из posts.urls, users.urls и about.urls: '
+        'перцентили задержки, число SQL-запросов и время отрисовки '
+        'шаблонов. Отчёт в JSON удобно сравнивать между коммитами '
+        'через --baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, default=0,
+            help='Сколько записей добавить перед замером.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=30,
+            help='Сколько раз запрашивать каждый адрес.',
+        )
+        parser.add_argument(
+            '--anonymous', action='store_true',
+            help='Запрашивать без входа на сайт.',
+        )
+        parser.add_argument(
+            '--output', help='Куда записать отчёт, по умолчанию stdout.',
+        )
+        parser.add_argument(
+            '--baseline', help='Отчёт, с которым сравнить результаты.',
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=20.0,
+            help='Рост p50 в процентах, который считается регрессией.',
+        )
+
+    def handle(self, *args, **options):
+        if options['posts']:
+            seed_posts(options['posts'])
+        post = Post.objects.exclude(group=None).select_related(
+            'author', 'group').first()
+        if post is None:
+            raise CommandError('Нет записей с группой, добавьте --posts N.')
+        self.user = post.author
+        self.values = {
+            'slug': post.group.slug,
+            'username': post.author.username,
+            'post_id': post.id,
+            'uidb64': urlsafe_base64_encode(force_bytes(post.author.pk)),
+            'token': default_token_generator.make_token(post.author),
+        }
+        report = {
+            'meta': {
+                'posts': Post.objects.count(),
+                'repeat': options['repeat'],
+                'anonymous': options['anonymous'],
+            },
+            'routes': {},
+        }
+        for name, pattern in self.routes():
+            result = self.measure(name, pattern, options)
+            if result is not None:
+                report['routes'][name] = result
+        self.write_report(report, options.get('output'))
+        if options['baseline']:
+            self.compare(report, options['baseline'], options['threshold'])
+
+    def routes(self):
+        resolver = get_resolver()
+        for namespace in NAMESPACES:
+            _, sub_resolver = resolver.namespace_dict[namespace]
+            for pattern in sub_resolver.url_patterns:
+                if pattern.name:
+                    yield f'{namespace}:{pattern.name}', pattern
+
+    def measure(self, name, pattern, options):
+        params = list(pattern.pattern.converters)
+        missing = [param for param in params if param not in self.values]
+        if missing:
+            self.stderr.write(f'{name}: не знаю значения {missing}')
+            return None
+        path = reverse(name, kwargs={
+            param: self.values[param] for param in params
+        })
+        client = Client()
+        latencies, queries, renders = [], [], []
+        for attempt in range(options['repeat'] + 1):
+            if not options['anonymous']:
+                client.force_login(self.user)
+            with record_queries() as recorder, record_templates() as tpl:
+                start = time.perf_counter()
+                try:
+                    status = client.get(path).status_code
+                except Exception as error:
+                    # Тестовый клиент пробрасывает исключения view;
+                    # адрес с ошибкой попадает в отчёт, а не рушит замер.
+                    self.stderr.write(f'{name}: {error!r}')
+                    return {'path': path, 'status': 500, 'error': repr(error)}
+                elapsed = time.perf_counter() - start
+            if not attempt:
+                continue
+            latencies.append(elapsed * 1000)
+            queries.append(len(recorder.queries))
+            renders.append(sum(duration for _, duration in tpl) * 1000)
+        return {
+            'path': path,
+            'status': status,
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p90_ms': round(percentile(latencies, 90), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'mean_ms': round(statistics.mean(latencies), 3),
+            'queries': max(queries),
+            'render_ms': round(statistics.median(renders), 3),
+        }
+
+    def write_report(self, report, output):
+        text = json.dumps(report, indent=2, sort_keys=True)
+        if output:
+            with open(output, 'w') as stream:
+                stream.write(text + '\n')
+        else:
+            sys.stdout.write(text + '\n')
+
+    def compare(self, report, baseline_path, threshold):
+        with open(baseline_path) as stream:
+            baseline = json.load(stream)['routes']
+        regressions = 0
+        for name, result in sorted(report['routes'].items()):
+            old = baseline.get(name)
+            if 'error' in result:
+                regressions += 1
+                self.stderr.write(self.style.ERROR(f'{name}: ошибка'))
+                continue
+            if old is None or 'error' in old:
+                self.stderr.write(f'{name}: нет в базовом отчёте')
+                continue
+            change = (result['p50_ms'] / old['p50_ms'] - 1) * 100
+            line = (
+                f'{name:<28} p50 {old["p50_ms"]:8.2f} -> '
+                f'{result["p50_ms"]:8.2f} мс ({change:+.0f}%), '
+                f'запросов {old["queries"]} -> {result["queries"]}'
+            )
+            if change > threshold or result['queries'] > old['queries']:
+                regressions += 1
+                self.stderr.write(self.style.ERROR(line))
+            else:
+                self.stderr.write(line)
+        if regressions:
+            raise CommandError(f'Регрессий: {regressions}.')
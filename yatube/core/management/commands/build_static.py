@@ -0,0 +1,61 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestFilesMixin, staticfiles_storage
+)
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+
+def compressed_sizes(root, suffix):
+    """(число файлов, байт до сжатия, байт после) для копий `suffix`."""
+    count = original = compressed = 0
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            if not filename.endswith(suffix):
+                continue
+            path = os.path.join(directory, filename)
+            count += 1
+            original += os.path.getsize(path[:-len(suffix)])
+            compressed += os.path.getsize(path)
+    return count, original, compressed
+
+
+class Command(BaseCommand):
+    help = (
+        'Собирает статику в STATIC_ROOT: файлы с хешем содержимого в '
+        'имени, манифест и сжатые копии .gz/.br. Нужен профиль '
+        'YATUBE_PROFILE=production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Удалить прежнюю сборку перед копированием.',
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(staticfiles_storage, ManifestFilesMixin):
+            raise CommandError(
+                'STATICFILES_STORAGE не строит манифест; запустите с '
+                'YATUBE_PROFILE=production.'
+            )
+        call_command(
+            'collectstatic', interactive=False, clear=options['clear'],
+            verbosity=0,
+        )
+        manifest = staticfiles_storage.load_manifest()
+        self.stdout.write(
+            f'{settings.STATIC_ROOT}: {len(manifest)} файлов с хешем, '
+            f'манифест {staticfiles_storage.manifest_name}'
+        )
+        for suffix in ('.gz', '.br'):
+            count, original, compressed = compressed_sizes(
+                settings.STATIC_ROOT, suffix
+            )
+            if count:
+                self.stdout.write(
+                    f'{suffix}: {count} файлов, '
+                    f'{original // 1024} КБ -> {compressed // 1024} КБ'
+                )
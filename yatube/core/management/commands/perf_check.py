@@ -0,0 +1,126 @@
+import importlib.util
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.template import engines
+
+from core.db import pragmas
+from core.warmup import has_cached_loader
+
+
+def database_items(alias):
+    connection = connections[alias]
+    max_age = connection.settings_dict['CONN_MAX_AGE']
+    items = [(
+        f'{alias}.CONN_MAX_AGE', max_age,
+        'соединение открывается на каждый запрос'
+        if settings.PRODUCTION and not max_age else None,
+    )]
+    actual = pragmas(connection)
+    for name, value in actual.items():
+        problem = None
+        if name == 'journal_mode' and str(value).lower() != 'wal':
+            problem = 'читатели блокируются на время записи'
+        items.append((f'{alias}.{name}', value, problem))
+    return items
+
+
+def collect():
+    """Список (настройка, значение, проблема или None)."""
+    production = settings.PRODUCTION
+    cached = has_cached_loader(engines['django'].engine)
+    items = [
+        ('PROFILE', settings.PROFILE, None),
+        (
+            'SECRET_KEY',
+            'development'
+            if settings.SECRET_KEY == settings.DEVELOPMENT_SECRET_KEY
+            else 'custom',
+            'ключ из репозитория, задайте YATUBE_SECRET_KEY'
+            if production
+            and settings.SECRET_KEY == settings.DEVELOPMENT_SECRET_KEY
+            else None,
+        ),
+        (
+            'DEBUG', settings.DEBUG,
+            'DEBUG включён в продакшене'
+            if production and settings.DEBUG else None,
+        ),
+        (
+            'template_loaders', 'cached' if cached else 'uncached',
+            'шаблоны компилируются на каждый запрос'
+            if production and not cached else None,
+        ),
+        (
+            'STATICFILES_STORAGE', settings.STATICFILES_STORAGE,
+            'статика без хеша в имени и без сжатых копий'
+            if production and 'Manifest' not in settings.STATICFILES_STORAGE
+            else None,
+        ),
+        (
+            'PASSWORD_HASHER_PROFILE', settings.PASSWORD_HASHER_PROFILE,
+            'не установлен пакет argon2-cffi'
+            if settings.PASSWORD_HASHER_PROFILE == 'argon2'
+            and importlib.util.find_spec('argon2') is None else None,
+        ),
+        ('PASSWORD_HASHING_THREADS', settings.PASSWORD_HASHING_THREADS, None),
+        ('CACHES.default', settings.CACHES['default']['BACKEND'], None),
+        ('POSTS_FEED_CACHE_TIMEOUT', settings.POSTS_FEED_CACHE_TIMEOUT, None),
+        ('DATABASE_REPLICAS', settings.DATABASE_REPLICAS, None),
+        (
+            'TASKS_ALWAYS_EAGER', settings.TASKS_ALWAYS_EAGER,
+            'фоновые задачи выполняются внутри запроса'
+            if production and settings.TASKS_ALWAYS_EAGER else None,
+        ),
+        (
+            'PROFILING', settings.PROFILING,
+            'профилирование замедляет каждый запрос'
+            if production and settings.PROFILING else None,
+        ),
+    ]
+    for alias in connections:
+        items += database_items(alias)
+    return items
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает, какие настройки, влияющие на скорость, действуют '
+        'в текущем профиле (YATUBE_PROFILE), и предупреждает о '
+        'неподходящих для продакшена. Удобно запускать перед стартом '
+        'сервера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--json', action='store_true',
+            help='Вывести отчёт в JSON.',
+        )
+        parser.add_argument(
+            '--strict', action='store_true',
+            help='Завершиться с ошибкой, если есть предупреждения.',
+        )
+
+    def handle(self, *args, **options):
+        items = collect()
+        problems = [item for item in items if item[2]]
+        if options['json']:
+            self.stdout.write(json.dumps(
+                {
+                    name: {'value': value, 'problem': problem}
+                    for name, value, problem in items
+                },
+                ensure_ascii=False, indent=2, default=str,
+            ))
+        else:
+            for name, value, problem in items:
+                line = f'{name}: {value}'
+                if problem:
+                    line = self.style.WARNING(f'{line}  <- {problem}')
+                self.stdout.write(line)
+        if options['strict'] and problems:
+            raise CommandError(
+                f'Предупреждений: {len(problems)}'
+            )
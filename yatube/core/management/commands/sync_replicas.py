@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.replication import replicate_all
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу во все реплики из DATABASE_REPLICAS; '
+        'для локальной проверки чтения с реплик.'
+    )
+
+    def handle(self, *args, **options):
+        aliases = replicate_all()
+        if not aliases:
+            raise CommandError(
+                'Реплики не настроены, задайте YATUBE_DB_REPLICAS.'
+            )
+        self.stdout.write(f'Скопировано в: {", ".join(aliases)}')
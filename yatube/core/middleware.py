@@ -0,0 +1,254 @@
+import cProfile
+import mimetypes
+import os
+import random
+import re
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.shortcuts import render
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .hashers import HashingBusy
+from .instrumentation import record_queries, record_templates
+from .routers import routing
+
+STICKY_KEY = '_primary_until'
+
+_lock = threading.Lock()
+_history = deque(maxlen=getattr(settings, 'PROFILING_HISTORY', 500))
+
+
+def record(entry):
+    with _lock:
+        _history.append(entry)
+
+
+def reset():
+    with _lock:
+        _history.clear()
+
+
+def summary():
+    """Сводка по последним запросам, сгруппированная по имени view."""
+    with _lock:
+        entries = list(_history)
+    views = defaultdict(list)
+    templates = defaultdict(list)
+    for entry in entries:
+        views[entry['view']].append(entry)
+        for name, duration in entry['templates']:
+            templates[name].append(duration)
+    result = {'requests': len(entries), 'views': {}, 'templates': {}}
+    for view, items in sorted(views.items()):
+        totals = sorted(item['total_ms'] for item in items)
+        result['views'][view] = {
+            'count': len(items),
+            'p50_ms': round(statistics.median(totals), 3),
+            'max_ms': round(totals[-1], 3),
+            'sql_ms': round(
+                statistics.mean(item['sql_ms'] for item in items), 3),
+            'queries': max(item['queries'] for item in items),
+            'duplicates': max(item['duplicates'] for item in items),
+        }
+    for name, durations in sorted(templates.items()):
+        result['templates'][name] = {
+            'count': len(durations),
+            'p50_ms': round(statistics.median(durations), 3),
+        }
+    return result
+
+
+class ProfilingMiddleware:
+    """Замеряет SQL, шаблоны и общее время каждого запроса.
+
+    Включается настройкой PROFILING. Итоги уходят в заголовок
+    Server-Timing и в скользящую статистику процесса, а доля
+    PROFILING_SAMPLE_RATE запросов дополнительно снимается cProfile.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = None
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            profile = cProfile.Profile()
+        start = time.perf_counter()
+        with record_queries() as queries, record_templates() as templates:
+            if profile is None:
+                response = self.get_response(request)
+            else:
+                profile.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profile.disable()
+        total = (time.perf_counter() - start) * 1000
+        view = self.view_name(request)
+        sql = queries.total_time * 1000
+        duplicates = queries.duplicates()
+        render = sum(duration for _, duration in templates) * 1000
+        response['Server-Timing'] = ', '.join((
+            f'sql;dur={sql:.2f};desc="{len(queries.queries)} queries, '
+            f'{duplicates} duplicates"',
+            f'tpl;dur={render:.2f}',
+            f'total;dur={total:.2f}',
+        ))
+        record({
+            'view': view,
+            'status': response.status_code,
+            'total_ms': total,
+            'sql_ms': sql,
+            'queries': len(queries.queries),
+            'duplicates': duplicates,
+            'templates': [
+                (name, duration * 1000) for name, duration in templates
+            ],
+        })
+        if profile is not None:
+            self.dump(profile, view)
+        return response
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        return match.view_name if match else request.path
+
+    @staticmethod
+    def dump(profile, view):
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        slug = re.sub(r'\W+', '-', view).strip('-')
+        profile.dump_stats(os.path.join(
+            settings.PROFILING_DIR, f'{time.time_ns()}-{slug}.prof'))
+
+
+class ReplicaMiddleware:
+    """Отправляет чтение view из REPLICA_VIEWS на реплики.
+
+    После запроса, который что-то записал, сессия на
+    REPLICA_STICKY_SECONDS закрепляется за основной базой, чтобы автор
+    сразу видел свою запись, даже если реплика ещё отстаёт. Ставится
+    после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routing() as state:
+            request.db_routing = state
+            response = self.get_response(request)
+        session = getattr(request, 'session', None)
+        if state.wrote and session is not None:
+            session[STICKY_KEY] = time.time() + settings.REPLICA_STICKY_SECONDS
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.resolver_match.view_name not in settings.REPLICA_VIEWS:
+            return None
+        session = getattr(request, 'session', None)
+        if session is not None and session.get(STICKY_KEY, 0) > time.time():
+            return None
+        request.db_routing.replicas = True
+        return None
+
+
+class HashingBusyMiddleware:
+    """Отвечает 503, если пул хеширования паролей переполнен.
+
+    Вход, регистрация и смена пароля во время штурма не ждут места в
+    пуле дольше PASSWORD_HASHING_TIMEOUT (доли секунды) и получают отказ
+    с Retry-After вместо того, чтобы занимать воркер.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, HashingBusy):
+            return None
+        response = render(request, 'core/503.html', status=503)
+        response['Retry-After'] = settings.PASSWORD_HASHING_RETRY_AFTER
+        return response
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную статику из STATIC_ROOT без похода во view.
+
+    Если клиент принимает br или gzip и рядом лежит сжатая копия,
+    отдаётся она. Файлы с хешем в имени (см. CompressedManifest-
+    StaticFilesStorage) не меняются, поэтому кешируются браузером на
+    год без перепроверки; остальные — на STATICFILES_MAX_AGE секунд.
+    Включается настройкой STATICFILES_SERVE.
+    """
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'STATICFILES_SERVE', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.root = os.path.realpath(settings.STATIC_ROOT)
+        self.prefix = settings.STATIC_URL
+        self.hashed = set(getattr(staticfiles_storage, 'hashed_files', {})
+                          .values())
+
+    def __call__(self, request):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or not request.path.startswith(self.prefix)
+        ):
+            return self.get_response(request)
+        name = request.path[len(self.prefix):]
+        path = os.path.realpath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(
+            path
+        ):
+            return self.get_response(request)
+        return self.serve(request, name, path)
+
+    def serve(self, request, name, path):
+        stat = os.stat(path)
+        if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            stat.st_mtime, stat.st_size,
+        ):
+            return HttpResponseNotModified()
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = None
+        for candidate, suffix in self.ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+        content_type = mimetypes.guess_type(name)[0]
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Vary'] = 'Accept-Encoding'
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if name in self.hashed:
+            response['Cache-Control'] = (
+                'public, max-age=31536000, immutable'
+            )
+        else:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATICFILES_MAX_AGE}'
+            )
+        return response
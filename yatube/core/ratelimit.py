@@ -0,0 +1,160 @@
+"""Ограничение частоты запросов: корзина токенов на область и клиента.
+
+Корзина вмещает `capacity` токенов и равномерно наполняется заново за
+`period` секунд (настройка RATELIMITS). Каждый запрос забирает токен,
+при пустой корзине ответ — 429 с заголовком Retry-After. Клиент — это
+пользователь, если он вошёл, иначе IP-адрес.
+
+Корзины хранятся в кеше Django, чтобы при общем кеше (Redis) лимит был
+один на все процессы; запись защищена блокировкой через `cache.add`.
+Если кеш недоступен или блокировку не удалось взять, корзина берётся
+из памяти процесса — там изменение атомарно под threading.Lock.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+KEY_PREFIX = 'ratelimit'
+LOCK_ATTEMPTS = 10
+LOCK_WAIT = 0.005
+
+_lock = threading.Lock()
+_buckets = OrderedDict()
+_counters = defaultdict(lambda: {'allowed': 0, 'limited': 0, 'fallback': 0})
+
+
+def take(state, capacity, period, now):
+    """Новое состояние корзины (токены, время) и сколько секунд ждать.
+
+    `state` — прежнее состояние или None для полной корзины; ожидание
+    0 значит, что токен выдан.
+    """
+    tokens = capacity
+    if state is not None:
+        tokens, updated = state
+        tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) * period / capacity
+
+
+def take_memory(key, capacity, period):
+    with _lock:
+        now = time.monotonic()
+        state = _buckets.pop(key, None)
+        # Корзины лежат от давно не тронутых к свежим. Простоявшие самый
+        # длинный период уже полны, их можно забыть; если этого мало,
+        # вытесняются самые старые, чтобы словарь не рос больше
+        # RATELIMIT_MEMORY_KEYS при запросах с множества адресов.
+        longest = max(period for _, period in settings.RATELIMITS.values())
+        while _buckets:
+            _, updated = next(iter(_buckets.values()))
+            if (
+                len(_buckets) < settings.RATELIMIT_MEMORY_KEYS
+                and now - updated <= longest
+            ):
+                break
+            _buckets.popitem(last=False)
+        _buckets[key], wait = take(state, capacity, period, now)
+    return wait
+
+
+def take_cache(key, capacity, period):
+    """Как take_memory, но в кеше; None — взять блокировку не вышло."""
+    lock = f'{key}:lock'
+    for _ in range(LOCK_ATTEMPTS):
+        if cache.add(lock, 1, timeout=1):
+            break
+        time.sleep(LOCK_WAIT)
+    else:
+        return None
+    try:
+        state, wait = take(cache.get(key), capacity, period, time.time())
+        # Через period без запросов корзина снова полна, ключ не нужен.
+        cache.set(key, state, timeout=math.ceil(period))
+    finally:
+        cache.delete(lock)
+    return wait
+
+
+def ip_id(request):
+    return 'ip:' + request.META.get(settings.RATELIMIT_IP_HEADER, '')
+
+
+def client_id(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return ip_id(request)
+
+
+def check(request, scope, client=None):
+    """Забирает токен области `scope`; секунды до повтора или 0.
+
+    `client` — ключ клиента вместо пользователя или IP по умолчанию.
+    """
+    if not settings.RATELIMIT_ENABLED:
+        return 0
+    capacity, period = settings.RATELIMITS[scope]
+    key = f'{KEY_PREFIX}:{scope}:{client or client_id(request)}'
+    wait = None
+    if settings.RATELIMIT_STORAGE == 'cache':
+        try:
+            wait = take_cache(key, capacity, period)
+        except Exception:
+            # Недоступный кеш не должен ронять вход и регистрацию.
+            wait = None
+    fallback = wait is None
+    if fallback:
+        wait = take_memory(key, capacity, period)
+    with _lock:
+        counters = _counters[scope]
+        counters['limited' if wait else 'allowed'] += 1
+        if fallback and settings.RATELIMIT_STORAGE == 'cache':
+            counters['fallback'] += 1
+    return wait
+
+
+def stats():
+    """Счётчики по областям: пропущено, отклонено, обходов кеша."""
+    with _lock:
+        return {scope: dict(counters) for scope, counters in _counters.items()}
+
+
+def reset():
+    with _lock:
+        _buckets.clear()
+        _counters.clear()
+
+
+def too_many_requests(request, wait):
+    retry_after = math.ceil(wait)
+    response = render(
+        request, 'core/429.html', {'retry_after': retry_after}, status=429
+    )
+    response['Retry-After'] = retry_after
+    return response
+
+
+def ratelimit(scope, methods=('POST',)):
+    """Декоратор view: запросы `methods` сверх лимита получают 429.
+
+    По умолчанию считаются только POST — открыть форму можно сколько
+    угодно раз.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method in methods:
+                wait = check(request, scope)
+                if wait:
+                    return too_many_requests(request, wait)
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
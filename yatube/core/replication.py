@@ -0,0 +1,24 @@
+"""Копирование SQLite-базы на реплики через sqlite3 backup API.
+
+Настоящей репликации у SQLite нет; для разработки и тестов реплика —
+это копия основного файла на момент вызова `replicate`.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def replicate(target, source=DEFAULT_DB_ALIAS):
+    """Перезаписывает базу `target` содержимым `source`.
+
+    Backup не проходит, пока у соединения `source` открыта транзакция
+    на запись, поэтому в тестах нужен TransactionTestCase.
+    """
+    for alias in (source, target):
+        connections[alias].ensure_connection()
+    connections[source].connection.backup(connections[target].connection)
+
+
+def replicate_all(source=DEFAULT_DB_ALIAS):
+    for alias in settings.DATABASE_REPLICAS:
+        replicate(alias, source)
+    return list(settings.DATABASE_REPLICAS)
@@ -0,0 +1,64 @@
+"""Чтение с реплик для view из REPLICA_VIEWS.
+
+Реплики перечислены в DATABASE_REPLICAS. Роутер сам не знает, какой
+view сейчас работает: это отмечает `ReplicaMiddleware` через
+`routing`. Всё остальное — записи, формы, фоновые задачи — идёт
+в `default`. Сессии всегда читаются с основной базы: иначе только что
+вошедший пользователь мог бы не найти свою сессию на отстающей реплике.
+"""
+import random
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_APPS = {'sessions'}
+
+_local = threading.local()
+
+
+@contextmanager
+def routing():
+    """Отслеживает записи в базу до конца блока.
+
+    Чтение с реплик включается выставлением `replicas` у возвращённого
+    состояния; после первой записи чтение снова идёт с основной базы,
+    чтобы код видел только что сохранённые данные.
+    """
+    previous = getattr(_local, 'state', None)
+    _local.state = state = SimpleNamespace(replicas=False, wrote=False)
+    try:
+        yield state
+    finally:
+        _local.state = previous
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        state = getattr(_local, 'state', None)
+        if (
+            not replicas
+            or state is None
+            or not state.replicas
+            or state.wrote
+            or model._meta.app_label in PRIMARY_APPS
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = getattr(_local, 'state', None)
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # На репликах те же данные, что и в основной базе.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема попадает на реплики вместе с данными.
+        return db not in settings.DATABASE_REPLICAS
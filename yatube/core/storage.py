@@ -0,0 +1,54 @@
+"""Статика с хешем в имени и заранее сжатыми копиями."""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.ico', '.txt', '.json', '.xml')
+# Сжатая копия пишется, только если она хотя бы на 5% меньше.
+MIN_RATIO = 0.95
+
+
+def compressors():
+    yield '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage, который после collectstatic кладёт
+    рядом с хешированными файлами .gz и, если установлен пакет
+    brotli, .br. Отдаёт их core.middleware.StaticFilesMiddleware.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed.add(hashed_name)
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name in sorted(hashed):
+                self.compress(name)
+
+    def compress(self, name):
+        """Пишет сжатые копии файла и возвращает их суффиксы."""
+        if not name.endswith(COMPRESSIBLE):
+            return []
+        with self.open(name) as original:
+            data = original.read()
+        written = []
+        for suffix, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) > len(data) * MIN_RATIO:
+                continue
+            with open(self.path(name + suffix), 'wb') as target:
+                target.write(compressed)
+            written.append(suffix)
+        return written
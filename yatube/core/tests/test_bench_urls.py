@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class BenchUrlsCommandTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='bench_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output = os.path.join(self.directory.name, 'report.json')
+
+    def bench(self, *args):
+        call_command(
+            'bench_urls', '--repeat', '2', '--output', self.output, *args,
+            stderr=StringIO(),
+        )
+        with open(self.output) as stream:
+            return json.load(stream)
+
+    def test_report_covers_every_route(self):
+        report = self.bench()
+        routes = report['routes']
+        for name in ('posts:index', 'posts:post_edit', 'users:signup',
+                     'users:password_reset_confirm', 'about:tech'):
+            with self.subTest(name=name):
+                self.assertIn(name, routes)
+        for name, result in routes.items():
+            with self.subTest(name=name):
+                self.assertNotIn('error', result)
+                self.assertLess(result['status'], 500)
+                self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+                self.assertGreater(result['queries'], 0)
+
+    def test_baseline_flags_extra_queries(self):
+        report = self.bench()
+        report['routes']['posts:index']['queries'] -= 1
+        baseline = os.path.join(self.directory.name, 'baseline.json')
+        with open(baseline, 'w') as stream:
+            json.dump(report, stream)
+        with self.assertRaises(CommandError):
+            self.bench('--baseline', baseline, '--threshold', '1000')
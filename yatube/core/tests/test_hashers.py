@@ -0,0 +1,108 @@
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import hashers
+
+User = get_user_model()
+PASSWORD = 'secret-pass-1'
+HASHERS = [
+    'core.hashers.PBKDF2PasswordHasher',
+    'core.hashers.ScryptPasswordHasher',
+]
+FAST_SCRYPT = {'work_factor': 2 ** 8, 'block_size': 8, 'parallelism': 1}
+
+
+@override_settings(
+    PASSWORD_HASHERS=HASHERS,
+    PASSWORD_PBKDF2_ITERATIONS=2000,
+    PASSWORD_SCRYPT=FAST_SCRYPT,
+    PASSWORD_HASHING_THREADS=1,
+    PASSWORD_HASHING_QUEUE=0,
+)
+class PasswordHashingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='hash_user')
+        self.guest_client = Client()
+
+    def login(self):
+        return self.guest_client.post(
+            reverse('users:login'),
+            {'username': 'hash_user', 'password': PASSWORD},
+        )
+
+    def test_login_rehashes_with_current_parameters(self):
+        self.user.password = get_hasher().encode(PASSWORD, 'salt', 1000)
+        self.user.save()
+        self.assertEqual(self.login().status_code, 302)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_login_upgrades_to_profile_hasher(self):
+        self.user.set_password(PASSWORD)
+        self.user.save()
+        with self.settings(PASSWORD_HASHERS=HASHERS[::-1]):
+            self.assertEqual(self.login().status_code, 302)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$256$'))
+        self.assertTrue(self.user.check_password(PASSWORD))
+
+    def test_hashing_runs_in_pool(self):
+        names = []
+        original = hashers.BaseScryptPasswordHasher.encode
+
+        def encode(*args):
+            names.append(threading.current_thread().name)
+            return original(*args)
+
+        with mock.patch.object(
+            hashers.BaseScryptPasswordHasher, 'encode', encode
+        ), self.settings(PASSWORD_HASHERS=HASHERS[::-1]):
+            encoded = make_password(PASSWORD)
+            with self.settings(PASSWORD_HASHING_THREADS=0):
+                make_password(PASSWORD)
+        self.assertTrue(encoded.startswith('scrypt$'))
+        self.assertTrue(names[0].startswith('hashing'))
+        self.assertEqual(names[1], threading.current_thread().name)
+
+    def test_busy_pool_returns_503(self):
+        self.user.set_password(PASSWORD)
+        self.user.save()
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=hashers.offload, args=(block,))
+        worker.start()
+        started.wait(5)
+        try:
+            start = time.perf_counter()
+            response = self.login()
+            elapsed = time.perf_counter() - start
+        finally:
+            release.set()
+            worker.join()
+        self.assertEqual(response.status_code, 503)
+        # Отказ сразу, воркер не ждёт освобождения пула.
+        self.assertLess(elapsed, 1)
+        self.assertTemplateUsed(response, 'core/503.html')
+        self.assertEqual(self.login().status_code, 302)
+
+    def test_bench_logins(self):
+        out = StringIO()
+        call_command(
+            'bench_logins', '--profiles', 'pbkdf2,scrypt', '--logins', '2',
+            '--threads', '1,2', '--target-ms', '10', stdout=out,
+        )
+        self.assertIn('PASSWORD_PBKDF2_ITERATIONS', out.getvalue())
+        self.assertIn("PASSWORD_SCRYPT['work_factor']", out.getvalue())
@@ -0,0 +1,51 @@
+import json
+import os
+import runpy
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+
+from django.core.management import call_command
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from ..db import apply_pragmas, pragmas
+
+
+class PerfCheckTest(TestCase):
+    def test_report_lists_settings(self):
+        out = StringIO()
+        call_command('perf_check', '--json', '--strict', stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['PROFILE']['value'], 'development')
+        self.assertIn('default.CONN_MAX_AGE', report)
+
+    @override_settings(PRODUCTION=True, TASKS_ALWAYS_EAGER=True)
+    def test_strict_fails_on_production_problems(self):
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('perf_check', '--strict', stdout=out)
+        self.assertIn('TASKS_ALWAYS_EAGER: True  <-', out.getvalue())
+        self.assertIn('default.CONN_MAX_AGE: 0  <-', out.getvalue())
+        self.assertIn('SECRET_KEY: development  <-', out.getvalue())
+
+    def test_production_requires_secret_key(self):
+        path = os.path.join(settings.BASE_DIR, 'yatube', 'settings.py')
+        with mock.patch.dict(os.environ, {'YATUBE_PROFILE': 'production'}):
+            os.environ.pop('YATUBE_SECRET_KEY', None)
+            with self.assertRaises(ImproperlyConfigured):
+                runpy.run_path(path)
+            os.environ['YATUBE_SECRET_KEY'] = 'production-key'
+            production = runpy.run_path(path)
+        self.assertEqual(production['SECRET_KEY'], 'production-key')
+
+    def test_pragmas_applied_to_connection(self):
+        self.addCleanup(
+            connection.connection.execute, 'PRAGMA cache_size = -2000'
+        )
+        with override_settings(SQLITE_PRAGMAS={'cache_size': -1234}):
+            apply_pragmas(sender=None, connection=connection)
+            self.assertEqual(pragmas(connection), {'cache_size': -1234})
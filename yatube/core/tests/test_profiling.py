@@ -0,0 +1,71 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+from .. import middleware
+
+User = get_user_model()
+
+
+@override_settings(PROFILING=True, PROFILING_SAMPLE_RATE=0)
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='profile_user')
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        middleware.reset()
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('posts:index'))
+        timing = response['Server-Timing']
+        for metric in ('sql;dur=', 'tpl;dur=', 'total;dur='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, timing)
+        self.assertIn('0 duplicates', timing)
+
+    def test_stats_endpoint(self):
+        self.client.force_login(self.staff)
+        self.client.get(reverse('posts:index'))
+        self.client.get(reverse('posts:index'))
+        stats = self.client.get(reverse('profiling_stats')).json()
+        index = stats['views']['posts:index']
+        self.assertEqual(index['count'], 2)
+        self.assertGreater(index['queries'], 0)
+        self.assertIn('posts/index.html', stats['templates'])
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.client.force_login(self.post_author)
+        response = self.client.get(reverse('profiling_stats'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_sampled_requests_dump_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(PROFILING_SAMPLE_RATE=1,
+                               PROFILING_DIR=directory):
+                self.client.get(reverse('posts:index'))
+            names = os.listdir(directory)
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names[0].endswith('-posts-index.prof'))
+
+    @override_settings(PROFILING=False)
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
@@ -0,0 +1,146 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from .. import ratelimit
+
+User = get_user_model()
+LIMITS = {
+    'post_create': (2, 60),
+    'post_edit': (2, 60),
+    'signup': (2, 60),
+    'login': (2, 60),
+    'password_reset': (2, 60),
+}
+
+
+@override_settings(RATELIMITS=LIMITS, RATELIMIT_STORAGE='cache')
+class RateLimitTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(
+            username='limited_user', password='secret-pass-1'
+        )
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        ratelimit.reset()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def test_post_create_is_limited(self):
+        url = reverse('posts:post_create')
+        for text in ('Первая', 'Вторая'):
+            response = self.authorized_client.post(url, {'text': text})
+            self.assertEqual(response.status_code, 302)
+        response = self.authorized_client.post(url, {'text': 'Третья'})
+        self.assertEqual(response.status_code, 429)
+        self.assertTemplateUsed(response, 'core/429.html')
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(Post.objects.count(), 2)
+        response = self.authorized_client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_auth_endpoints_are_limited_per_ip(self):
+        for name in ('users:login', 'users:signup', 'users:password_reset'):
+            url = reverse(name)
+            with self.subTest(name=name):
+                statuses = [
+                    self.client.post(url, {}).status_code for _ in range(3)
+                ]
+                self.assertEqual(statuses[-1], 429)
+                self.assertNotIn(429, statuses[:-1])
+                response = self.client.post(
+                    url, {}, REMOTE_ADDR='10.0.0.2'
+                )
+                self.assertNotEqual(response.status_code, 429)
+
+    def test_tokens_refill_over_time(self):
+        state, wait = ratelimit.take(None, 2, 60, now=0)
+        state, wait = ratelimit.take(state, 2, 60, now=0)
+        self.assertEqual(wait, 0)
+        state, wait = ratelimit.take(state, 2, 60, now=10)
+        self.assertAlmostEqual(wait, 20)
+        state, wait = ratelimit.take(state, 2, 60, now=30)
+        self.assertEqual(wait, 0)
+
+    def test_memory_fallback_when_cache_fails(self):
+        url = reverse('posts:post_create')
+        with mock.patch.object(
+            ratelimit.cache, 'add', side_effect=ConnectionError
+        ):
+            statuses = [
+                self.authorized_client.post(url, {'text': 'Текст'})
+                .status_code for _ in range(3)
+            ]
+        self.assertEqual(statuses, [302, 302, 429])
+        self.assertEqual(
+            ratelimit.stats()['post_create'],
+            {'allowed': 2, 'limited': 1, 'fallback': 3},
+        )
+
+    @override_settings(RATELIMIT_STORAGE='memory', RATELIMIT_MEMORY_KEYS=2)
+    def test_memory_buckets_are_capped(self):
+        url = reverse('users:login')
+        for address in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            for _ in range(2):
+                self.client.post(url, {}, REMOTE_ADDR=address)
+        self.assertEqual(len(ratelimit._buckets), 2)
+        # Корзина первого адреса вытеснена, он снова начинает с полной.
+        response = self.client.post(url, {}, REMOTE_ADDR='10.0.0.1')
+        self.assertNotEqual(response.status_code, 429)
+        response = self.client.post(url, {}, REMOTE_ADDR='10.0.0.3')
+        self.assertEqual(response.status_code, 429)
+
+    def test_api_post_create_is_limited(self):
+        token = base64.b64encode(b'limited_user:secret-pass-1').decode()
+        for status in (201, 201, 429):
+            response = self.client.post(
+                reverse('api:posts'), '{"text": "Текст"}',
+                content_type='application/json',
+                HTTP_AUTHORIZATION=f'Basic {token}',
+            )
+            self.assertEqual(response.status_code, status)
+        self.assertEqual(response.json()['retry_after'], 30)
+
+    def test_api_basic_auth_is_charged_to_login(self):
+        token = base64.b64encode(b'limited_user:wrong').decode()
+        statuses = [
+            self.client.post(
+                reverse('api:posts'), '{"text": "Текст"}',
+                content_type='application/json',
+                HTTP_AUTHORIZATION=f'Basic {token}',
+            ).status_code for _ in range(3)
+        ]
+        self.assertEqual(statuses, [401, 401, 429])
+        response = self.client.post(
+            reverse('users:login'),
+            {'username': 'limited_user', 'password': 'secret-pass-1'},
+        )
+        self.assertEqual(response.status_code, 429)
+
+    def test_api_post_edit_is_limited(self):
+        post = Post.objects.create(text='Текст', author=self.post_author)
+        url = reverse('api:post_detail', args=[post.pk])
+        statuses = [
+            self.authorized_client.patch(
+                url, '{"text": "Правка"}', content_type='application/json'
+            ).status_code for _ in range(3)
+        ]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.authorized_client.post(reverse('posts:post_create'), {})
+        response = self.authorized_client.get(reverse('ratelimit_stats'))
+        self.assertEqual(response.status_code, 403)
+        self.client.force_login(self.staff)
+        stats = self.client.get(reverse('ratelimit_stats')).json()
+        self.assertEqual(stats['post_create']['allowed'], 1)
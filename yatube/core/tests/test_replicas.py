@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+from ..replication import replicate
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTest(TransactionTestCase):
+    # Записи после теста удаляются, но счётчики id растут: тесты, которые
+    # ждут /posts/1/, упали бы после этого класса.
+    reset_sequences = True
+
+    @classmethod
+    def tearDownClass(cls):
+        # В Django 2.2 reset_sequences для SQLite ничего не делает,
+        # поэтому счётчики после последней очистки базы сбрасываются здесь.
+        connection = connections['default']
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM sqlite_sequence')
+        super().tearDownClass()
+
+    def setUp(self):
+        self.post_author = User.objects.create_user(username='replica_user')
+        self.reader = User.objects.create_user(username='replica_reader')
+        self.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        Post.objects.create(
+            text='Старая запись', author=self.post_author, group=self.group
+        )
+        cache.clear()
+        handle, path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        connections.databases['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': path,
+        }
+        self.addCleanup(self.drop_replica, path)
+        replicate('replica')
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def drop_replica(self, path):
+        connections['replica'].close()
+        del connections.databases['replica']
+        delattr(connections._connections, 'replica')
+        os.remove(path)
+
+    def test_feeds_read_from_replica(self):
+        Post.objects.create(text='Свежая запись', author=self.post_author)
+        Group.objects.create(title='Новая группа', slug='new')
+        for client in (self.guest_client, self.reader_client):
+            response = client.get(reverse('posts:index'))
+            self.assertContains(response, 'Старая запись')
+            self.assertNotContains(response, 'Свежая запись')
+        response = self.guest_client.get(reverse('posts:group_index'))
+        self.assertContains(response, 'Новая группа')
+
+    def test_author_reads_primary_after_write(self):
+        self.authorized_client.post(
+            reverse('posts:post_create'), data={'text': 'Свежая запись'}
+        )
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Свежая запись')
+        response = self.reader_client.get(reverse('posts:index'))
+        self.assertNotContains(response, 'Свежая запись')
+        replicate('replica')
+        response = self.reader_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Свежая запись')
@@ -0,0 +1,70 @@
+import gzip
+import re
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+STATIC_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+    STATICFILES_SERVE=True,
+)
+class StaticFilesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command('build_static', stdout=StringIO())
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        # Закешированная главная ссылалась бы на статику без хеша.
+        cache.clear()
+        self.guest_client = Client()
+
+    def stylesheet(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        return re.search(
+            r'/static/css/bootstrap\.min\.[0-9a-f]{12}\.css',
+            response.content.decode(),
+        ).group()
+
+    def test_hashed_file_is_precompressed_and_immutable(self):
+        path = self.stylesheet()
+        response = self.guest_client.get(path, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        css = gzip.decompress(b''.join(response.streaming_content))
+        plain = self.guest_client.get(path)
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(css, b''.join(plain.streaming_content))
+
+    def test_unhashed_file_is_revalidated(self):
+        response = self.guest_client.get('/static/css/bootstrap.min.css')
+        self.assertNotIn('immutable', response['Cache-Control'])
+        again = self.guest_client.get(
+            '/static/css/bootstrap.min.css',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+        self.assertEqual(again.status_code, 304)
+
+    def test_images_are_not_compressed(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        logo = re.search(
+            r'/static/img/logo\.[0-9a-f]{12}\.png', response.content.decode()
+        ).group()
+        response = self.guest_client.get(logo, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
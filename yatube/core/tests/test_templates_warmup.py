@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+from copy import deepcopy
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.template import engines
+from django.test import TestCase, override_settings
+
+from posts.models import Group, Post
+
+from ..warmup import warm_up
+
+User = get_user_model()
+CACHED_TEMPLATES = deepcopy(settings.TEMPLATES)
+CACHED_TEMPLATES[0]['APP_DIRS'] = False
+CACHED_TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+class TemplateWarmUpTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='template_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def test_warm_up_skipped_without_cached_loader(self):
+        with override_settings(DEBUG=True):
+            self.assertEqual(warm_up(), [])
+
+    @override_settings(TEMPLATES=CACHED_TEMPLATES)
+    def test_warm_up_fills_cached_loader(self):
+        names = warm_up()
+        self.assertIn('base.html', names)
+        self.assertIn('includes/post_card.html', names)
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertTrue(set(names) <= set(loader.get_template_cache))
+
+    def test_bench_templates_reports_every_template(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'report.json')
+            call_command(
+                'bench_templates', '--repeat', '1', '--output', output,
+                stdout=StringIO(),
+            )
+            with open(output) as report_file:
+                report = json.load(report_file)
+        templates = {entry['template']: entry for entry in report}
+        self.assertIn('posts/index.html', templates)
+        self.assertIn('core/404.html', templates)
+        for entry in report:
+            self.assertNotIn('error', entry)
+            self.assertGreater(entry['uncached_ms'], 0)
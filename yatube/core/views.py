@@ -1,5 +1,11 @@
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 from django.shortcuts import render
 
+from posts import cache as feed_cache
+
+from . import middleware, ratelimit
+
 
 def page_not_found(request, exception):
     return render(request, 'core/404.html', {'path': request.path}, status=404)
@@ -15,3 +21,24 @@ def permission_denied(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+def profiling_stats(request):
+    """Скользящая статистика ProfilingMiddleware, только для персонала."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse(middleware.summary())
+
+
+def ratelimit_stats(request):
+    """Счётчики ограничения частоты запросов, только для персонала."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse(ratelimit.stats())
+
+
+def feed_cache_stats(request):
+    """Попадания в кеш лент и карточек, только для персонала."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse(feed_cache.stats())
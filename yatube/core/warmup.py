@@ -0,0 +1,42 @@
+"""Прогрев кеша шаблонов при старте процесса."""
+import os
+
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+
+def template_names(dirs):
+    """Имена всех .html-шаблонов в каталогах `dirs`, как для get_template."""
+    names = set()
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith('.html'):
+                    path = os.path.relpath(
+                        os.path.join(root, filename), directory
+                    )
+                    names.add(path.replace(os.sep, '/'))
+    return sorted(names)
+
+
+def has_cached_loader(engine):
+    return any(
+        isinstance(loader, CachedLoader) for loader in engine.template_loaders
+    )
+
+
+def warm_up():
+    """Компилирует шаблоны из TEMPLATES['DIRS'] в кеш cached loader.
+
+    Без cached loader (режим разработки) ничего не делает: там шаблоны
+    всё равно перечитываются на каждый запрос. Ошибка в шаблоне
+    всплывает сразу при старте процесса, а не на первом запросе.
+    Возвращает список прогретых шаблонов.
+    """
+    engine = engines['django'].engine
+    if not has_cached_loader(engine):
+        return []
+    names = template_names(engine.dirs)
+    for name in names:
+        engine.get_template(name)
+    return names
@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import DeliveryBatch, OutboxMessage
+
+
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'subject',
+        'status',
+        'attempts',
+        'created',
+        'sent',
+    )
+    list_filter = ('status',)
+    search_fields = ('subject', 'recipients')
+
+
+class DeliveryBatchAdmin(admin.ModelAdmin):
+    list_display = ('started', 'duration', 'sent', 'failed', 'rate')
+
+
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
+admin.site.register(DeliveryBatch, DeliveryBatchAdmin)
@@ -0,0 +1,27 @@
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+
+from .models import OutboxMessage
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Кладёт письма в таблицу исходящих вместо отправки.
+
+    Запрос, отправивший письмо (например, сброс пароля), отвечает
+    сразу; доставкой пачками занимается `outbox.delivery.deliver`
+    в воркере очереди или в команде send_outbox.
+    """
+
+    def send_messages(self, email_messages):
+        messages = [
+            OutboxMessage.from_email_message(message)
+            for message in email_messages
+            if message.recipients()
+        ]
+        if not messages:
+            return 0
+        from .jobs import send_outbox
+        with transaction.atomic():
+            OutboxMessage.objects.bulk_create(messages)
+            send_outbox.delay()
+        return len(messages)
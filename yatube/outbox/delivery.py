@@ -0,0 +1,89 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.utils import timezone
+
+from .models import DeliveryBatch, OutboxMessage
+
+
+def claim(limit):
+    """Забирает до `limit` писем из очереди, как `tasks.queue.claim`.
+
+    Письма, зависшие в `sending` дольше OUTBOX_LEASE секунд (воркер
+    упал посреди пачки), снова считаются свободными.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.OUTBOX_LEASE)
+    pending = OutboxMessage.objects.filter(status=OutboxMessage.PENDING)
+    expired = OutboxMessage.objects.filter(
+        status=OutboxMessage.SENDING, locked_at__lt=stale
+    )
+    claimed = []
+    for message_id, status in (pending | expired).values_list(
+        'id', 'status'
+    )[:limit]:
+        taken = OutboxMessage.objects.filter(pk=message_id, status=status)
+        if status == OutboxMessage.SENDING:
+            taken = taken.filter(locked_at__lt=stale)
+        if taken.update(status=OutboxMessage.SENDING, locked_at=now):
+            claimed.append(message_id)
+    return list(OutboxMessage.objects.filter(pk__in=claimed))
+
+
+def deliver(batch_size=None):
+    """Отправляет пачку писем через одно соединение с почтовым сервером.
+
+    Письма уходят по одному, чтобы отказ адресата не ронял всю пачку:
+    неудачное письмо возвращается в очередь, пока не исчерпает
+    OUTBOX_MAX_ATTEMPTS. Возвращает `DeliveryBatch` или None, если
+    отправлять нечего.
+    """
+    messages = claim(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not messages:
+        return None
+    started = timezone.now()
+    start = time.perf_counter()
+    sent = failed = 0
+    connection = get_connection(
+        settings.OUTBOX_DELIVERY_BACKEND, fail_silently=False
+    )
+    try:
+        connection.open()
+        for message in messages:
+            try:
+                connection.send_messages([message.to_email_message()])
+            except Exception as error:
+                failed += 1
+                fail(message, error)
+            else:
+                sent += 1
+                message.status = OutboxMessage.SENT
+                message.sent = timezone.now()
+                message.attempts += 1
+                message.save(update_fields=['status', 'sent', 'attempts'])
+    except Exception as error:
+        # Не удалось даже соединиться: вся пачка ждёт следующего раза.
+        for message in messages:
+            if message.status == OutboxMessage.SENDING:
+                failed += 1
+                fail(message, error)
+    finally:
+        connection.close()
+    return DeliveryBatch.objects.create(
+        started=started,
+        duration=time.perf_counter() - start,
+        sent=sent,
+        failed=failed,
+    )
+
+
+def fail(message, error):
+    message.attempts += 1
+    message.last_error = repr(error)
+    if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboxMessage.FAILED
+    else:
+        message.status = OutboxMessage.PENDING
+    message.save(update_fields=['attempts', 'last_error', 'status'])
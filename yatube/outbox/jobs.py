@@ -0,0 +1,18 @@
+from tasks.queue import task
+
+from .delivery import deliver
+
+
+@task(unique=True)
+def send_outbox():
+    """Доставляет очередь писем пачками, пока она не опустеет.
+
+    Если в пачке были сбои, задача падает, и очередь задач повторит
+    её с растущей паузой; письма к тому времени уже снова в очереди.
+    """
+    while True:
+        batch = deliver()
+        if batch is None:
+            return
+        if batch.failed:
+            raise RuntimeError(f'Не отправлено писем: {batch.failed}')
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from outbox.delivery import deliver
+from outbox.models import DeliveryBatch, OutboxMessage
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет накопленные письма пачками через одно соединение '
+        'и печатает скорость доставки. С --stats только показывает '
+        'последние проходы и состояние очереди.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--stats', action='store_true')
+
+    def handle(self, *args, **options):
+        if not options['stats']:
+            while True:
+                batch = deliver(options['batch_size'])
+                if batch is None:
+                    break
+                self.stdout.write(self.describe(batch))
+                if batch.failed:
+                    break
+            return
+        for batch in DeliveryBatch.objects.all()[:10]:
+            self.stdout.write(self.describe(batch))
+        for status, title in OutboxMessage.STATUSES:
+            count = OutboxMessage.objects.filter(status=status).count()
+            self.stdout.write(f'{title}: {count}')
+
+    @staticmethod
+    def describe(batch):
+        return (
+            f'{batch.started:%H:%M:%S} отправлено {batch.sent}, '
+            f'с ошибкой {batch.failed}, {batch.rate:.0f} писем/с'
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.9 on 2026-10-18 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbox', '0002_message_locked_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='attachments',
+            field=models.TextField(default='[]', help_text='JSON: имя файла, содержимое в base64 и MIME-тип', verbose_name='Вложения'),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='content_subtype',
+            field=models.CharField(default='plain', help_text='plain или html', max_length=30, verbose_name='Тип текста'),
+        ),
+    ]
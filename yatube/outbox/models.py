@@ -0,0 +1,154 @@
+import base64
+import json
+from email.mime.base import MIMEBase
+
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+
+
+class OutboxMessage(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    subject = models.CharField(max_length=998, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    content_subtype = models.CharField(
+        max_length=30,
+        default='plain',
+        verbose_name='Тип текста',
+        help_text='plain или html'
+    )
+    html = models.TextField(blank=True, verbose_name='HTML-версия')
+    from_email = models.CharField(max_length=254, verbose_name='Отправитель')
+    recipients = models.TextField(
+        verbose_name='Получатели',
+        help_text='JSON: to, cc, bcc и reply_to'
+    )
+    headers = models.TextField(default='{}', verbose_name='Заголовки')
+    attachments = models.TextField(
+        default='[]',
+        verbose_name='Вложения',
+        help_text='JSON: имя файла, содержимое в base64 и MIME-тип'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Состояние'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взято в отправку'
+    )
+    sent = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    def __str__(self):
+        return f'{self.subject} ({self.status})'
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='outbox_status_idx'),
+        ]
+
+    @classmethod
+    def from_email_message(cls, message):
+        """Строка очереди из письма Django.
+
+        Всё, что нельзя сохранить без потерь (другие альтернативы,
+        кроме одной HTML-версии, вложения-MIMEBase, своя кодировка),
+        отклоняется с ValueError, а не теряется молча.
+        """
+        if message.encoding:
+            raise ValueError('Письма со своей кодировкой не поддерживаются')
+        alternatives = getattr(message, 'alternatives', [])
+        if len(alternatives) > 1 or any(
+            mimetype != 'text/html' for _, mimetype in alternatives
+        ):
+            raise ValueError('Поддерживается только одна HTML-версия письма')
+        html = alternatives[0][0] if alternatives else ''
+        attachments = []
+        for attachment in message.attachments:
+            if isinstance(attachment, MIMEBase):
+                raise ValueError('Вложения MIMEBase не поддерживаются')
+            filename, content, mimetype = attachment
+            if isinstance(content, str):
+                content = content.encode()
+            attachments.append({
+                'filename': filename,
+                'content': base64.b64encode(content).decode('ascii'),
+                'mimetype': mimetype,
+            })
+        return cls(
+            subject=message.subject,
+            body=message.body,
+            content_subtype=message.content_subtype,
+            html=html,
+            from_email=message.from_email,
+            recipients=json.dumps({
+                'to': list(message.to),
+                'cc': list(message.cc),
+                'bcc': list(message.bcc),
+                'reply_to': list(message.reply_to),
+            }),
+            headers=json.dumps(message.extra_headers),
+            attachments=json.dumps(attachments),
+        )
+
+    def to_email_message(self, connection=None):
+        recipients = json.loads(self.recipients)
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            headers=json.loads(self.headers),
+            connection=connection,
+            **recipients,
+        )
+        message.content_subtype = self.content_subtype
+        if self.html:
+            message.attach_alternative(self.html, 'text/html')
+        for attachment in json.loads(self.attachments):
+            message.attach(
+                attachment['filename'],
+                base64.b64decode(attachment['content']),
+                attachment['mimetype'],
+            )
+        return message
+
+
+class DeliveryBatch(models.Model):
+    """Итог одного прохода доставки: сколько писем и за какое время."""
+    started = models.DateTimeField(verbose_name='Начало')
+    duration = models.FloatField(verbose_name='Длительность, с')
+    sent = models.PositiveIntegerField(verbose_name='Отправлено')
+    failed = models.PositiveIntegerField(verbose_name='С ошибкой')
+
+    def __str__(self):
+        return f'{self.started:%Y-%m-%d %H:%M:%S}: {self.sent}/{self.failed}'
+
+    class Meta:
+        ordering = ['-started']
+
+    @property
+    def rate(self):
+        return self.sent / self.duration if self.duration else 0
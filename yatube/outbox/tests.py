@@ -0,0 +1,179 @@
+import socketserver
+import threading
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task
+
+from .delivery import claim, deliver
+from .models import OutboxMessage
+
+User = get_user_model()
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Минимальный SMTP-сервер: принимает письма и складывает в список."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost')
+        recipients = []
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip('<> ')
+                if address in self.server.rejected:
+                    self.reply('550 no such user')
+                    continue
+                recipients.append(address)
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 go ahead')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.delivered.extend(recipients)
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+@override_settings(
+    EMAIL_BACKEND='outbox.backends.OutboxEmailBackend',
+    OUTBOX_DELIVERY_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST='127.0.0.1',
+    OUTBOX_BATCH_SIZE=50,
+    OUTBOX_MAX_ATTEMPTS=2,
+    TASKS_ALWAYS_EAGER=False,
+)
+class OutboxTest(TestCase):
+    def setUp(self):
+        self.smtp = socketserver.ThreadingTCPServer(
+            ('127.0.0.1', 0), SMTPHandler
+        )
+        self.smtp.daemon_threads = True
+        self.smtp.connections = 0
+        self.smtp.delivered = []
+        self.smtp.rejected = set()
+        thread = threading.Thread(target=self.smtp.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.smtp.server_close)
+        self.addCleanup(self.smtp.shutdown)
+        settings = override_settings(EMAIL_PORT=self.smtp.server_address[1])
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def send(self, count):
+        for i in range(count):
+            mail.send_mail('Тема', 'Текст', None, [f'user{i}@example.com'])
+
+    def test_messages_are_queued_not_sent(self):
+        self.send(3)
+        self.assertEqual(OutboxMessage.objects.count(), 3)
+        self.assertEqual(self.smtp.connections, 0)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_batch_uses_one_connection(self):
+        self.send(120)
+        batches = []
+        while True:
+            batch = deliver()
+            if batch is None:
+                break
+            batches.append(batch)
+        self.assertEqual([batch.sent for batch in batches], [50, 50, 20])
+        self.assertEqual(self.smtp.connections, 3)
+        self.assertEqual(len(self.smtp.delivered), 120)
+        self.assertFalse(
+            OutboxMessage.objects.exclude(status=OutboxMessage.SENT).exists()
+        )
+
+    def test_failures_are_retried_then_given_up(self):
+        self.send(3)
+        self.smtp.rejected.add('user1@example.com')
+        batch = deliver()
+        self.assertEqual((batch.sent, batch.failed), (2, 1))
+        failed = OutboxMessage.objects.get(status=OutboxMessage.PENDING)
+        self.assertIn('550', failed.last_error)
+        deliver()
+        failed.refresh_from_db()
+        self.assertEqual(
+            (failed.status, failed.attempts), (OutboxMessage.FAILED, 2)
+        )
+        self.assertIsNone(deliver())
+
+    def test_abandoned_messages_are_reclaimed(self):
+        self.send(3)
+        self.assertEqual(len(claim(2)), 2)
+        # Воркер упал, не отправив взятые письма.
+        batch = deliver()
+        self.assertEqual(batch.sent, 1)
+        self.assertIsNone(deliver())
+        OutboxMessage.objects.filter(status=OutboxMessage.SENDING).update(
+            locked_at=timezone.now() - timedelta(seconds=11 * 60)
+        )
+        batch = deliver()
+        self.assertEqual(batch.sent, 2)
+        self.assertEqual(len(self.smtp.delivered), 3)
+
+    def test_message_round_trip_keeps_everything(self):
+        message = mail.EmailMultiAlternatives(
+            'Тема', 'Текст', 'from@example.com', ['to@example.com'],
+            cc=['cc@example.com'], bcc=['bcc@example.com'],
+            reply_to=['reply@example.com'], headers={'X-Tag': 'digest'},
+        )
+        message.attach_alternative('<p>Текст</p>', 'text/html')
+        message.attach('notes.txt', 'Заметки', 'text/plain')
+        message.attach('image.png', b'\x89PNG\x00', 'image/png')
+        message.send()
+        restored = OutboxMessage.objects.get().to_email_message()
+        for field in ('subject', 'body', 'from_email', 'to', 'cc', 'bcc',
+                      'reply_to', 'extra_headers', 'alternatives',
+                      'attachments'):
+            with self.subTest(field=field):
+                self.assertEqual(
+                    getattr(restored, field), getattr(message, field)
+                )
+        self.assertEqual(len(restored.recipients()), 3)
+
+    def test_html_body_keeps_subtype(self):
+        message = mail.EmailMessage('Тема', '<p>Текст</p>', None, ['a@b.c'])
+        message.content_subtype = 'html'
+        message.send()
+        restored = OutboxMessage.objects.get().to_email_message()
+        self.assertIn('text/html', restored.message()['Content-Type'])
+
+    def test_unsupported_messages_are_rejected(self):
+        message = mail.EmailMultiAlternatives('Тема', 'Текст', None, ['a@b.c'])
+        message.attach_alternative('Текст', 'text/markdown')
+        with self.assertRaises(ValueError):
+            message.send()
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_password_reset_goes_through_outbox(self):
+        User.objects.create_user(
+            username='reset_user', email='reset@example.com',
+            password='password'
+        )
+        self.client.post(
+            reverse('users:password_reset'), {'email': 'reset@example.com'}
+        )
+        message = OutboxMessage.objects.get()
+        self.assertIn('reset@example.com', message.recipients)
+        deliver()
+        self.assertEqual(self.smtp.delivered, ['reset@example.com'])
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Post, Group
+from . import search
+from .models import Follow, GroupStats, Post, Group
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -16,7 +17,15 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        if search_term and search.is_available():
+            return search.filter_matching(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
 
 admin.site.register(Post, PostAdmin),
 
 admin.site.register(Group)
+
+admin.site.register(Follow)
+admin.site.register(GroupStats)
@@ -0,0 +1,86 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from .models import Group, Post, User
+
+BENCH_PREFIX = 'bench'
+WORDS = (
+    'йатуб', 'пост', 'группа', 'автор', 'лента', 'django', 'python',
+    'индекс', 'запрос', 'кеш', 'страница', 'текст', 'котик', 'новость',
+)
+
+
+def seed_posts(count, authors=50, groups=10, batch_size=1000):
+    """Добавляет `count` записей от служебных авторов в служебные группы.
+
+    Авторы и группы создаются один раз и переиспользуются при повторных
+    запусках, поэтому данные можно наращивать порциями.
+    """
+    User.objects.bulk_create(
+        (
+            User(
+                username=f'{BENCH_PREFIX}_{i}',
+                first_name='Автор',
+                last_name=str(i),
+                password=make_password(None),
+            ) for i in range(authors)
+        ),
+        ignore_conflicts=True,
+    )
+    Group.objects.bulk_create(
+        (
+            Group(
+                title=f'Группа {i}',
+                slug=f'{BENCH_PREFIX}-{i}',
+                description='Группа для замеров',
+            ) for i in range(groups)
+        ),
+        ignore_conflicts=True,
+    )
+    author_ids = list(
+        User.objects.filter(username__startswith=f'{BENCH_PREFIX}_')
+        .values_list('id', flat=True)
+    )
+    group_ids = list(
+        Group.objects.filter(slug__startswith=f'{BENCH_PREFIX}-')
+        .values_list('id', flat=True)
+    )
+    rnd = random.Random(count)
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        with transaction.atomic():
+            Post.objects.bulk_create(
+                Post(
+                    text=' '.join(rnd.choices(WORDS, k=rnd.randint(5, 40))),
+                    author_id=rnd.choice(author_ids),
+                    group_id=rnd.choice(group_ids + [None]),
+                ) for _ in range(size)
+            )
+        created += size
+    return created
+
+
+def timed(func, repeat):
+    """Медиана и максимум времени выполнения `func` в миллисекундах."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def explain(queryset):
+    """Строки плана выполнения запроса, которым выбирается `queryset`."""
+    sql, params = queryset.query.sql_with_params()
+    prefix = (
+        'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'{prefix} {sql}', params)
+        return [' '.join(str(col) for col in row) for row in cursor]
@@ -0,0 +1,191 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from django.utils.safestring import mark_safe
+
+STATS = Counter()
+STATS_LOCK = threading.Lock()
+CARD_TEMPLATE = 'includes/post_card.html'
+# Заголовки, которые хранятся в кеше вместе со страницей.
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary')
+
+
+def get_cache():
+    return caches[settings.POSTS_FEED_CACHE]
+
+
+def version_key(scope):
+    return f'feed:version:{scope}'
+
+
+def get_versions(cache, scopes):
+    """Текущие метки версий; пропавшие из кеша заводятся заново.
+
+    Новая метка берётся из времени, а не с единицы, чтобы после
+    вытеснения метки не совпасть со старыми сохранёнными страницами.
+    """
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*scopes):
+    """Сдвигает метки версий: страницы этих лент больше не найдутся."""
+    cache = get_cache()
+    for scope in scopes:
+        key = version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate_all():
+    invalidate('all')
+
+
+def page_key(request, scope):
+    cache = get_cache()
+    versions = get_versions(cache, ('all', scope))
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return 'feed:page:{}:{}:{}'.format(path, *versions)
+
+
+def count(event, amount=1):
+    with STATS_LOCK:
+        STATS[event] += amount
+
+
+def hit_rate(hits, misses):
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def stats():
+    with STATS_LOCK:
+        hits, misses = STATS['hits'], STATS['misses']
+        card_hits, card_misses = STATS['card_hits'], STATS['card_misses']
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hit_rate(hits, misses),
+        'card_hits': card_hits,
+        'card_misses': card_misses,
+        'card_hit_rate': hit_rate(card_hits, card_misses),
+    }
+
+
+def card_scopes(post):
+    """Метки версий, от которых зависит карточка, кроме самой записи.
+
+    Карточка выводит имя автора и может выводить группу: переименование
+    автора или группы сдвигает эти метки (см. posts.signals).
+    """
+    return (f'card:author:{post.author_id}', f'card:group:{post.group_id}')
+
+
+def scope_versions(scopes):
+    """Словарь меток версий для `scopes`, одним запросом к кешу."""
+    scopes = sorted(set(scopes))
+    return dict(zip(scopes, get_versions(get_cache(), scopes)))
+
+
+def card_key(post, versions):
+    stamps = ':'.join(str(versions[scope]) for scope in card_scopes(post))
+    return f'post_card:{post.pk}:{post.updated.timestamp()}:{stamps}'
+
+
+def render_cards(posts):
+    """Проставляет записям `card_html`: одним get_many из кеша, а
+    отсутствующие карточки рендерит и сохраняет одним set_many.
+
+    Возвращает число попаданий и промахов.
+    """
+    cache = get_cache()
+    posts = list(posts)
+    scopes = list({scope for post in posts for scope in card_scopes(post)})
+    versions = dict(zip(scopes, get_versions(cache, scopes)))
+    posts = {card_key(post, versions): post for post in posts}
+    cached = cache.get_many(posts)
+    rendered = {}
+    for key, post in posts.items():
+        html = cached.get(key)
+        if html is None:
+            html = rendered[key] = render_to_string(
+                CARD_TEMPLATE, {'post': post}
+            )
+        post.card_html = mark_safe(html)
+    if rendered:
+        cache.set_many(rendered, settings.POSTS_CARD_CACHE_TIMEOUT)
+    hits, misses = len(posts) - len(rendered), len(rendered)
+    count('card_hits', hits)
+    count('card_misses', misses)
+    return hits, misses
+
+
+def cached_response(request, cached):
+    """Ответ из кеша страниц; 304, если ETag у клиента совпадает."""
+    response = HttpResponse(cached['content'])
+    for header, value in cached['headers'].items():
+        response[header] = value
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=parse_http_date_safe(response.get('Last-Modified')),
+        response=response,
+    )
+
+
+def cache_feed(scope, kwarg=None):
+    """Кеширует страницу ленты для анонимных посетителей.
+
+    Ключ собирается из адреса страницы и меток версий: общей (`all`) и
+    ленты (`scope` или `scope:<значение kwarg>`), поэтому изменение одной
+    записи сбрасывает только те ленты, где она видна.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = settings.POSTS_FEED_CACHE_TIMEOUT
+            if (
+                not timeout
+                or request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            name = scope if kwarg is None else f'{scope}:{kwargs[kwarg]}'
+            key = page_key(request, name)
+            cached = get_cache().get(key)
+            if cached is not None:
+                count('hits')
+                response = cached_response(request, cached)
+                response['X-Feed-Cache'] = 'hit'
+                return response
+            count('misses')
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                get_cache().set(key, {
+                    'content': response.content,
+                    'headers': {
+                        header: response[header]
+                        for header in CACHED_HEADERS
+                        if response.has_header(header)
+                    },
+                }, timeout)
+            response['X-Feed-Cache'] = 'miss'
+            return response
+        return wrapper
+    return decorator
@@ -7,10 +7,11 @@ from .models import Post
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
-        fields = ('text', 'group')
+        fields = ('text', 'group', 'image')
         labels = {
             'text': _('Текст поста'),
             'group': _('Группа, к которой относится пост'),
+            'image': _('Картинка'),
         }
         help_texts = {
             'text': _('Введите текст'),
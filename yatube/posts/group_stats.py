@@ -0,0 +1,56 @@
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Group, GroupStats, Post
+
+
+def top_authors(group_id, limit):
+    rows = Post.objects.filter(group_id=group_id).order_by().values(
+        'author__username', 'author__first_name', 'author__last_name'
+    ).annotate(posts=Count('id')).order_by('-posts', 'author__username')
+    return [
+        {
+            'username': row['author__username'],
+            'name': ' '.join(filter(None, (
+                row['author__first_name'], row['author__last_name']
+            ))),
+            'posts': row['posts'],
+        }
+        for row in rows[:limit]
+    ]
+
+
+def refresh():
+    """Пересчитывает `GroupStats` для всех групп, возвращает их число.
+
+    Даты последних записей берутся одним GROUP BY, активные авторы —
+    отдельным запросом на группу по индексу (group, pub_date).
+    """
+    now = timezone.now()
+    last_dates = dict(
+        Post.objects.exclude(group=None).order_by().values_list('group')
+        .annotate(Max('pub_date'))
+    )
+    existing = set(GroupStats.objects.values_list('group_id', flat=True))
+    created, updated = [], []
+    for group_id in Group.objects.values_list('id', flat=True):
+        stats = GroupStats(
+            group_id=group_id,
+            last_post_date=last_dates.get(group_id),
+            top_authors=json.dumps(
+                top_authors(group_id, settings.POSTS_GROUP_TOP_AUTHORS),
+                ensure_ascii=False,
+            ),
+            refreshed=now,
+        )
+        (updated if group_id in existing else created).append(stats)
+    with transaction.atomic():
+        GroupStats.objects.bulk_create(created)
+        GroupStats.objects.bulk_update(
+            updated, ['last_post_date', 'top_authors', 'refreshed']
+        )
+    return len(created) + len(updated)
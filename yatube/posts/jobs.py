@@ -0,0 +1,30 @@
+"""Побочные действия записей, которые выполняет воркер очереди."""
+from tasks.queue import task
+
+from . import group_stats, thumbnails, timeline
+from .models import Post
+
+
+@task
+def fan_out_post(post_id):
+    post = Post.objects.filter(pk=post_id).only(
+        'author_id', 'pub_date'
+    ).first()
+    if post is not None:
+        timeline.fan_out(post)
+
+
+@task
+def backfill_timeline(user_id, author_id):
+    timeline.backfill(user_id, author_id)
+
+
+@task
+def generate_thumbnails(post_id):
+    thumbnails.refresh(post_id)
+
+
+@task
+def refresh_group_stats():
+    """Пересчитывает каталог групп; запускается по TASKS_PERIODIC."""
+    group_stats.refresh()
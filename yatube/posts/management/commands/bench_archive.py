@@ -0,0 +1,86 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from posts.benchmark import seed_posts
+from posts.models import Group
+
+
+def measure(client, path, params):
+    """Пиковая память (tracemalloc), время и размер ответа.
+
+    Время под tracemalloc завышено, сравнивать его стоит только между
+    собой.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(path, params)
+    content = (
+        response.streaming_content if response.streaming
+        else [response.content]
+    )
+    size = sum(len(chunk) for chunk in content)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'peak_kb': peak // 1024,
+        'ms': round(elapsed, 1),
+        'kb': size // 1024,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает архив группы (потоковая отрисовка, начало текста) '
+        'с обычной лентой группы на растущем размере страницы: пиковая '
+        'память процесса, время и размер ответа.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, default=0,
+            help='Сколько записей добавить перед замером.',
+        )
+        parser.add_argument(
+            '--sizes', default='100,500,1000,2000',
+            help='Размеры страницы через запятую.',
+        )
+
+    def handle(self, *args, **options):
+        if options['posts']:
+            seed_posts(options['posts'])
+        group = Group.objects.order_by('-posts_count').first()
+        if group is None or not group.posts_count:
+            raise CommandError('Нет записей в группах, добавьте --posts N.')
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        client = Client()
+        # Первый запрос компилирует шаблоны, в замер он не идёт.
+        measure(client, reverse('posts:group_archive', args=[group.slug]), {})
+        self.stdout.write(f'Группа {group.slug}: {group.posts_count} записей')
+        for size in sizes:
+            with override_settings(
+                POSTS_MAX_PAGE_SIZE=size,
+                POSTS_ARCHIVE_MAX_PAGE_SIZE=size,
+                POSTS_FEED_CACHE_TIMEOUT=0,
+            ):
+                archive = measure(
+                    client,
+                    reverse('posts:group_archive', args=[group.slug]),
+                    {'per_page': size},
+                )
+                feed = measure(
+                    client,
+                    reverse('posts:group_posts', args=[group.slug]),
+                    {'per_page': size},
+                )
+            self.stdout.write(
+                f'per_page={size:<6} '
+                f'archive: {archive["peak_kb"]} КБ пик, {archive["ms"]} мс, '
+                f'{archive["kb"]} КБ | '
+                f'feed: {feed["peak_kb"]} КБ пик, {feed["ms"]} мс, '
+                f'{feed["kb"]} КБ'
+            )
@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from posts.benchmark import explain, seed_posts, timed
+from posts.cache import get_cache
+from posts.models import Post
+from posts.paginator import CursorPaginator, seek
+
+PAGE_SIZE = settings.POSTS_PAGE_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет ленты index, group_posts и profile: план запроса '
+        'страницы и время ответа. С --compare повторяет замер без '
+        'составных индексов Post.Meta.indexes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, default=0,
+            help='Сколько записей добавить перед замером.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Сколько раз запрашивать каждую страницу.',
+        )
+        parser.add_argument(
+            '--compare', action='store_true',
+            help='Также замерить ленты без составных индексов.',
+        )
+
+    def handle(self, *args, **options):
+        if options['posts']:
+            seed_posts(options['posts'])
+        sample = Post.objects.exclude(group=None).first()
+        if sample is None:
+            raise CommandError('Нет записей с группой, добавьте --posts N.')
+        feeds = self.feeds(sample)
+        self.report('с индексами', feeds, options['repeat'])
+        if options['compare']:
+            indexes = Post._meta.indexes
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(Post, index)
+            # Карточки, отрисованные с индексами, не должны ускорять
+            # второй замер.
+            get_cache().clear()
+            try:
+                self.report('без индексов', feeds, options['repeat'])
+            finally:
+                with connection.schema_editor() as editor:
+                    for index in indexes:
+                        editor.add_index(Post, index)
+
+    def feeds(self, sample):
+        feeds = []
+        querysets = (
+            ('posts:index', {}, Post.objects.feed()),
+            (
+                'posts:group_posts', {'slug': sample.group.slug},
+                Post.objects.feed().filter(group=sample.group),
+            ),
+            (
+                'posts:profile', {'username': sample.author.username},
+                Post.objects.feed().filter(author=sample.author),
+            ),
+        )
+        for name, kwargs, queryset in querysets:
+            path = reverse(name, kwargs=kwargs)
+            deep_page = max(queryset.count() // PAGE_SIZE // 2, 1)
+            offset = (deep_page - 1) * PAGE_SIZE
+            middle = queryset[offset:offset + 1].get()
+            cursor = CursorPaginator(queryset, PAGE_SIZE).cursor_for(middle)
+            feeds.extend((
+                (f'{name} page=1', path, {}, queryset[:PAGE_SIZE]),
+                (
+                    f'{name} page={deep_page}', path, {'page': deep_page},
+                    queryset[offset:offset + PAGE_SIZE],
+                ),
+                (
+                    f'{name} cursor', path, {'cursor': cursor},
+                    seek(
+                        queryset, ('pub_date', 'id'),
+                        (middle.pub_date, middle.id),
+                    )[:PAGE_SIZE + 1],
+                ),
+            ))
+        return feeds
+
+    def report(self, title, feeds, repeat):
+        client = Client()
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Ленты {title}:'))
+        for label, path, params, queryset in feeds:
+            # Кеш страниц для анонимов отдал бы готовый ответ без запросов.
+            with override_settings(POSTS_FEED_CACHE_TIMEOUT=0):
+                median, worst = timed(
+                    lambda: client.get(path, params), repeat
+                )
+            self.stdout.write(self.style.MIGRATE_LABEL(f'  {label}'))
+            for line in explain(queryset):
+                self.stdout.write(f'    {line}')
+            self.stdout.write(
+                f'    медиана {median:.2f} мс, максимум {worst:.2f} мс'
+            )
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import search
+from posts.benchmark import WORDS, seed_posts, timed
+from posts.models import Post
+
+PAGE_SIZE = settings.POSTS_PAGE_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает поиск по индексу FTS5 с text__icontains: подсчёт '
+        'найденного и выборка первой страницы. Для замера на миллионе '
+        'записей запустите с --posts 1000000.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, default=0,
+            help='Сколько записей добавить перед замером.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз выполнять каждый поиск.',
+        )
+        parser.add_argument(
+            'queries', nargs='*', default=[WORDS[0], WORDS[-1]],
+            help='Поисковые запросы.',
+        )
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('Индекс FTS5 есть только у SQLite.')
+        if options['posts']:
+            seed_posts(options['posts'])
+        self.stdout.write(f'Записей: {Post.objects.count()}')
+        for query in options['queries']:
+            results = search.SearchResults(query)
+            scan = Post.objects.feed().filter(text__icontains=query)
+            for label, func in (
+                ('fts5 count', results.count),
+                ('icontains count', scan.count),
+                ('fts5 page', lambda: results[:PAGE_SIZE]),
+                ('icontains page', lambda: list(scan[:PAGE_SIZE])),
+            ):
+                median, worst = timed(func, options['repeat'])
+                self.stdout.write(
+                    f'{query!r:>12} {label:<16} медиана {median:8.2f} мс, '
+                    f'максимум {worst:8.2f} мс'
+                )
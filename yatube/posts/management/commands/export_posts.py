@@ -0,0 +1,46 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.archive import FORMATS, RowWriter
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает записи в JSON Lines или CSV, читая их из базы '
+        'порциями через iterator(), без загрузки всех записей в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл архива или - для stdout.')
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['path'] == '-':
+            exported, elapsed = self.dump(sys.stdout, options)
+        else:
+            try:
+                with open(options['path'], 'w', newline='',
+                          encoding='utf-8') as stream:
+                    exported, elapsed = self.dump(stream, options)
+            except OSError as error:
+                raise CommandError(error)
+        rate = exported / elapsed if elapsed else 0
+        self.stderr.write(
+            f'Выгружено {exported}, {rate:.0f} записей/с'
+        )
+
+    def dump(self, stream, options):
+        started = time.perf_counter()
+        writer = RowWriter(stream, options['format'])
+        rows = Post.objects.order_by('id').values_list(
+            'text', 'pub_date', 'author__username', 'group__slug'
+        ).iterator(chunk_size=options['batch_size'])
+        exported = 0
+        for text, pub_date, author, group in rows:
+            writer.write((text, pub_date.isoformat(), author, group or ''))
+            exported += 1
+        return exported, time.perf_counter() - started
@@ -0,0 +1,134 @@
+import sys
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from posts.archive import FORMATS, keep_pub_date, parse_pub_date, read_rows
+from posts.models import Group, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает записи из архива JSON Lines или CSV (поля text, '
+        'pub_date, author, group) пачками через bulk_create, не читая '
+        'файл в память целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл архива или - для stdin.')
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--create-authors', action='store_true',
+            help='Заводить неизвестных авторов без пароля.',
+        )
+        parser.add_argument(
+            '--create-groups', action='store_true',
+            help='Заводить неизвестные группы по slug.',
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.authors = {}
+        self.groups = {}
+        self.imported = self.skipped = 0
+        self.started = time.perf_counter()
+        if options['path'] == '-':
+            self.load(sys.stdin)
+        else:
+            try:
+                with open(options['path'], newline='',
+                          encoding='utf-8') as stream:
+                    self.load(stream)
+            except OSError as error:
+                raise CommandError(error)
+        self.report()
+
+    def load(self, stream):
+        batch = []
+        with keep_pub_date():
+            for row in read_rows(stream, self.options['format']):
+                if isinstance(row, ValueError):
+                    self.skip(row)
+                    continue
+                batch.append(row)
+                if len(batch) >= self.options['batch_size']:
+                    self.save(batch)
+                    batch = []
+            if batch:
+                self.save(batch)
+
+    def save(self, rows):
+        self.resolve(self.authors, User, 'username', rows, 'author')
+        self.resolve(self.groups, Group, 'slug', rows, 'group')
+        posts = []
+        for row in rows:
+            try:
+                posts.append(self.build(row))
+            except ValueError as error:
+                self.skip(error)
+        with transaction.atomic():
+            Post.objects.bulk_create(posts)
+        self.imported += len(posts)
+        if self.options['verbosity'] > 1:
+            self.report()
+
+    def skip(self, error):
+        self.skipped += 1
+        self.stderr.write(f'Пропущена запись: {error}')
+
+    def build(self, row):
+        author_id = self.authors.get(row.get('author'))
+        if author_id is None:
+            raise ValueError(f'неизвестный автор {row.get("author")!r}')
+        group_id = None
+        if row.get('group'):
+            group_id = self.groups.get(row['group'])
+            if group_id is None:
+                raise ValueError(f'неизвестная группа {row["group"]!r}')
+        if not row.get('text'):
+            raise ValueError('пустой текст')
+        return Post(
+            text=row['text'],
+            pub_date=parse_pub_date(row.get('pub_date')),
+            author_id=author_id,
+            group_id=group_id,
+        )
+
+    def resolve(self, known, model, field, rows, column):
+        """Дополняет карту `known` ключами из пачки одним запросом."""
+        wanted = {row.get(column) for row in rows} - set(known) - {None, ''}
+        if not wanted:
+            return
+        known.update(
+            model.objects.filter(**{f'{field}__in': wanted})
+            .values_list(field, 'id')
+        )
+        missing = wanted - set(known)
+        if not missing or not self.options[f'create_{column}s']:
+            return
+        if model is User:
+            new = (
+                User(username=name, password=make_password(None))
+                for name in missing
+            )
+        else:
+            new = (
+                Group(title=slug, slug=slug, description='')
+                for slug in missing
+            )
+        model.objects.bulk_create(new, ignore_conflicts=True)
+        known.update(
+            model.objects.filter(**{f'{field}__in': missing})
+            .values_list(field, 'id')
+        )
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        rate = self.imported / elapsed if elapsed else 0
+        self.stdout.write(
+            f'Загружено {self.imported}, пропущено {self.skipped}, '
+            f'{rate:.0f} записей/с'
+        )
@@ -0,0 +1,98 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from posts.models import AuthorStats, Follow, Group, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счётчики записей у авторов и групп и счётчики '
+        'подписчиков у авторов. '
+        'С --check только сверяет их с таблицей записей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Не исправлять, а завершиться с ошибкой при расхождении.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Размер пачки для bulk_update.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by()
+        author_counts = dict(
+            posts.values_list('author').annotate(Count('id'))
+        )
+        follower_counts = dict(
+            Follow.objects.order_by().values_list('author')
+            .annotate(Count('id'))
+        )
+        group_counts = dict(
+            posts.exclude(group=None).values_list('group')
+            .annotate(Count('id'))
+        )
+        with transaction.atomic():
+            stats = {
+                item.author_id: item
+                for item in AuthorStats.objects.select_for_update()
+            }
+            missing = [
+                AuthorStats(
+                    author_id=author_id,
+                    posts_count=author_counts.get(author_id, 0),
+                    followers_count=follower_counts.get(author_id, 0),
+                )
+                for author_id in set(author_counts) | set(follower_counts)
+                if author_id not in stats
+            ]
+            changed_stats = self.changed(
+                stats.values(), 'posts_count',
+                lambda item: author_counts.get(item.author_id, 0),
+            )
+            changed_followers = self.changed(
+                stats.values(), 'followers_count',
+                lambda item: follower_counts.get(item.author_id, 0),
+            )
+            changed_groups = self.changed(
+                Group.objects.select_for_update().only('posts_count'),
+                'posts_count',
+                lambda group: group_counts.get(group.pk, 0),
+            )
+            wrong = (
+                len(missing) + len(changed_stats) + len(changed_followers)
+                + len(changed_groups)
+            )
+            if options['check']:
+                if wrong:
+                    raise CommandError(f'Неверных счётчиков: {wrong}.')
+                self.stdout.write(self.style.SUCCESS('Счётчики верны.'))
+                return
+            AuthorStats.objects.bulk_create(
+                missing, batch_size=options['batch_size']
+            )
+            AuthorStats.objects.bulk_update(
+                set(changed_stats) | set(changed_followers),
+                ['posts_count', 'followers_count'],
+                batch_size=options['batch_size'],
+            )
+            Group.objects.bulk_update(
+                changed_groups, ['posts_count'],
+                batch_size=options['batch_size'],
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено счётчиков: {wrong}.'
+        ))
+
+    @staticmethod
+    def changed(objects, field, expected_count):
+        changed = []
+        for obj in objects:
+            count = expected_count(obj)
+            if getattr(obj, field) != count:
+                setattr(obj, field, count)
+                changed.append(obj)
+        return changed
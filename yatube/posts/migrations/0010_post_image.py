@@ -0,0 +1,25 @@
+# Generated by Django 2.2.9 on 2026-10-18 20:50
+
+from django.db import migrations, models
+import posts.models
+import posts.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=posts.storage.ContentAddressedStorage(), upload_to=posts.models.post_image_path, verbose_name='Картинка'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='thumbnails',
+            field=models.TextField(default='{}', editable=False, help_text='JSON: url, width и height для каждого размера', verbose_name='Миниатюры'),
+        ),
+    ]
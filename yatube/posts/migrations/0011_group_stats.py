@@ -0,0 +1,23 @@
+# Generated by Django 2.2.9 on 2026-10-18 20:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('last_post_date', models.DateTimeField(blank=True, null=True, verbose_name='Последняя запись')),
+                ('top_authors', models.TextField(default='[]', help_text='JSON: username, name и posts для каждого автора', verbose_name='Самые активные авторы')),
+                ('refreshed', models.DateTimeField(verbose_name='Пересчитано')),
+            ],
+        ),
+    ]
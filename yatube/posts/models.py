@@ -1,6 +1,16 @@
+import hashlib
+import json
+import os
+from collections import Counter
+
 from django.db import models
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.shortcuts import reverse
+from django.utils.functional import cached_property
+
+from . import cache
+from .storage import ContentAddressedStorage
 
 
 User = get_user_model()
@@ -17,14 +27,82 @@ class Group(models.Model):
         verbose_name='Описание группы',
         help_text='Вставьте описание группы'
     )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество записей'
+    )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # posts_count меняют только атомарные UPDATE из change_posts_count:
+        # сохранение загруженной раньше группы (админка, переименование)
+        # не должно затирать его устаревшим значением.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'posts_count'
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def change_posts_count(cls, group_id, delta):
+        groups = cls.objects.filter(pk=group_id)
+        if delta < 0:
+            groups = groups.filter(posts_count__gte=-delta)
+        groups.update(posts_count=F('posts_count') + delta)
+
     def get_absolute_url(self):
         return reverse('posts:group_posts', kwargs={'slug': self.slug})
 
 
+class PostQuerySet(models.QuerySet):
+    FEED_FIELDS = (
+        'text',
+        'pub_date',
+        'updated',
+        'author',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+        'group',
+        'group__title',
+        'group__slug',
+        'image',
+        'thumbnails',
+    )
+
+    def feed(self):
+        """Записи для лент: автор и группа одним JOIN, только нужные поля."""
+        return self.select_related('author', 'group').only(*self.FEED_FIELDS)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Как обычный bulk_create, но ещё обновляет счётчики записей."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        authors = Counter(post.author_id for post in objs)
+        groups = Counter(post.group_id for post in objs if post.group_id)
+        for author_id, delta in authors.items():
+            AuthorStats.change_posts_count(author_id, delta)
+        for group_id, delta in groups.items():
+            Group.change_posts_count(group_id, delta)
+        cache.invalidate_all()
+        return objs
+
+
+def post_image_path(instance, filename):
+    """Имя файла по хешу содержимого: картинку можно кешировать
+    в браузере навсегда, а одинаковые загрузки ложатся в один файл."""
+    digest = hashlib.sha256()
+    for chunk in instance.image.chunks():
+        digest.update(chunk)
+    instance.image.seek(0)
+    name = digest.hexdigest()
+    extension = os.path.splitext(filename)[1].lower()
+    return f'posts/{name[:2]}/{name}{extension}'
+
+
 class Post(models.Model):
     text = models.TextField(
         help_text='Вставьте текст поста',
@@ -33,6 +111,9 @@ class Post(models.Model):
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
         auto_now_add=True)
+    updated = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -49,12 +130,196 @@ class Post(models.Model):
         help_text='Выберите группу'
 
     )
+    image = models.ImageField(
+        'Картинка',
+        upload_to=post_image_path,
+        storage=ContentAddressedStorage(),
+        blank=True
+    )
+    thumbnails = models.TextField(
+        default='{}',
+        editable=False,
+        verbose_name='Миниатюры',
+        help_text='JSON: url, width и height для каждого размера'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     def __str__(self):
         return self.text[:15]
 
+    @cached_property
+    def thumbs(self):
+        """Готовые миниатюры по размерам из POSTS_THUMBNAIL_SIZES."""
+        return json.loads(self.thumbnails or '{}')
+
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', '-id']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pub_date_idx',
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_pub_date_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_pub_date_idx',
+            ),
+        ]
+
+
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество записей'
+    )
+    followers_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество подписчиков'
+    )
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
+
+    @classmethod
+    def change_count(cls, author_id, field, delta):
+        stats = cls.objects.filter(author_id=author_id)
+        if delta < 0:
+            stats.filter(**{f'{field}__gte': -delta}).update(
+                **{field: F(field) + delta}
+            )
+        elif not stats.update(**{field: F(field) + delta}):
+            cls.objects.get_or_create(author_id=author_id)
+            stats.update(**{field: F(field) + delta})
+
+    @classmethod
+    def change_posts_count(cls, author_id, delta):
+        cls.change_count(author_id, 'posts_count', delta)
+
+    @classmethod
+    def change_followers_count(cls, author_id, delta):
+        cls.change_count(author_id, 'followers_count', delta)
+
+    @classmethod
+    def posts_count_for(cls, author):
+        """Счётчик записей автора; для `select_related` не нужен запрос."""
+        try:
+            return author.post_stats.posts_count
+        except cls.DoesNotExist:
+            return 0
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower',
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Автор'
+    )
+
+    def __str__(self):
+        return f'{self.user} -> {self.author}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'],
+                name='unique_follow',
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    """Запись в готовой ленте подписок пользователя.
+
+    Строки раскладываются при публикации, поэтому лента `/follow/`
+    читается по индексу одного пользователя без JOIN по подпискам.
+    `pub_date` и `author` скопированы из записи для сортировки и
+    фильтрации без обращения к таблице записей.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='Читатель'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Запись'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор записи'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'],
+                name='unique_timeline_entry',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date', '-post'],
+                name='timeline_user_pub_date_idx',
+            ),
+        ]
+
+
+class GroupStats(models.Model):
+    """Сводка по группе для каталога `/groups/`.
+
+    Пересчитывается периодически (`refresh_group_stats`), а не при
+    каждой записи: каталог читает одну строку на группу вместо
+    GROUP BY по всем записям.
+    """
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Группа'
+    )
+    last_post_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последняя запись'
+    )
+    top_authors = models.TextField(
+        default='[]',
+        verbose_name='Самые активные авторы',
+        help_text='JSON: username, name и posts для каждого автора'
+    )
+    refreshed = models.DateTimeField(verbose_name='Пересчитано')
+
+    def __str__(self):
+        return f'{self.group}: {self.refreshed:%Y-%m-%d %H:%M}'
+
+    @cached_property
+    def authors(self):
+        return json.loads(self.top_authors)
 
 
 class Contact(models.Model):
@@ -0,0 +1,143 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(values, reverse=False):
+    """Упаковывает позицию в ленте в непрозрачную строку для `?cursor=`."""
+    payload = json.dumps(
+        {'v': [str(value) for value in values], 'r': int(reverse)},
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, fields):
+    if not cursor:
+        return None, False
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        raw_values = payload['v']
+        reverse = bool(payload['r'])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursor(cursor)
+    # encode_cursor пишет только строки, иначе курсор подделан.
+    if (
+        not isinstance(raw_values, list)
+        or len(raw_values) != len(fields)
+        or not all(isinstance(value, str) for value in raw_values)
+    ):
+        raise InvalidCursor(cursor)
+    try:
+        values = [
+            model._meta.get_field(name).to_python(value)
+            for name, value in zip(fields, raw_values)
+        ]
+    except ValidationError:
+        raise InvalidCursor(cursor)
+    if any(value is None for value in values):
+        raise InvalidCursor(cursor)
+    return values, reverse
+
+
+def seek(queryset, fields, values, reverse=False):
+    """Оставляет строки строго после позиции `values`.
+
+    Лента упорядочена по убыванию `fields`, поэтому условие раскрывается
+    в `(a < x) OR (a = x AND b < y) ...`, которое база выполняет поиском
+    по индексу, а не пропуском OFFSET строк.
+    """
+    lookup = 'gt' if reverse else 'lt'
+    condition = Q()
+    for position, name in enumerate(fields):
+        step = Q(**{f'{name}__{lookup}': values[position]})
+        for previous, value in zip(fields[:position], values):
+            step &= Q(**{previous: value})
+        condition |= step
+    return queryset.filter(condition)
+
+
+class CursorPage:
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.cursor_for(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.cursor_for(self.object_list[0], reverse=True)
+
+
+class CursorPaginator:
+    """Пагинация по ключу `(pub_date, id)` без COUNT(*) и OFFSET."""
+
+    def __init__(self, queryset, per_page, fields=('pub_date', 'id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.fields = tuple(fields)
+
+    def cursor_for(self, obj, reverse=False):
+        values = [getattr(obj, name) for name in self.fields]
+        return encode_cursor(values, reverse)
+
+    def get_page(self, cursor=None):
+        """Возвращает страницу; битый курсор даёт первую страницу."""
+        try:
+            values, reverse = decode_cursor(
+                cursor, self.queryset.model, self.fields
+            )
+        except InvalidCursor:
+            values, reverse = None, False
+        direction = '' if reverse else '-'
+        queryset = self.queryset.order_by(
+            *(f'{direction}{name}' for name in self.fields)
+        )
+        if values is not None:
+            queryset = seek(queryset, self.fields, values, reverse)
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+            return CursorPage(rows, self, True, has_more)
+        return CursorPage(rows, self, has_more, values is not None)
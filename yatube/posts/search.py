@@ -0,0 +1,170 @@
+"""Полнотекстовый поиск по записям на SQLite FTS5.
+
+Индекс `posts_post_fts` хранит только токены и берёт текст из самой
+таблицы записей (external content); синхронность обеспечивают триггеры,
+поэтому индекс видит и bulk_create, и update() запросов. SQLite при
+некоторых миграциях пересоздаёт таблицу записей вместе с её триггерами,
+так что после каждого migrate `install()` проверяет их и при пропаже
+перестраивает индекс.
+"""
+import re
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+TRIGGERS = {
+    'posts_post_fts_ai': (
+        'AFTER INSERT ON posts_post BEGIN '
+        'INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); '
+        'END'
+    ),
+    'posts_post_fts_ad': (
+        'AFTER DELETE ON posts_post BEGIN '
+        "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        'END'
+    ),
+    'posts_post_fts_au': (
+        'AFTER UPDATE OF text ON posts_post BEGIN '
+        "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+        "VALUES ('delete', old.id, old.text); "
+        'INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); '
+        'END'
+    ),
+}
+SNIPPET_START, SNIPPET_END = '\x02', '\x03'
+SNIPPET_TOKENS = 16
+
+
+def is_available(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def install(using=connection):
+    """Создаёт индекс и триггеры, если их нет, и заполняет индекс."""
+    if not is_available(using):
+        return
+    if Post._meta.db_table not in using.introspection.table_names():
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            'AND tbl_name = %s', [Post._meta.db_table]
+        )
+        existing = {name for name, in cursor.fetchall()}
+        if existing >= set(TRIGGERS):
+            return
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            "text, content='posts_post', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        for name, body in TRIGGERS.items():
+            cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def uninstall(using=connection):
+    if not is_available(using):
+        return
+    with using.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def match_expression(query):
+    """Запрос посетителя как FTS5-выражение: все слова, каждое в кавычках.
+
+    Кавычки не дают спецсимволам FTS5 (`-`, `*`, `NEAR`...) из строки
+    поиска превратиться в синтаксис запроса.
+    """
+    return ' '.join(f'"{term}"' for term in re.findall(r'\w+', query))
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(SNIPPET_START, '<mark>')
+        .replace(SNIPPET_END, '</mark>')
+    )
+
+
+class SearchResults:
+    """Найденные записи в порядке релевантности (bm25).
+
+    Поддерживает `count()` и срезы, поэтому подходит для `Paginator`:
+    страница выбирается из индекса через LIMIT, а записи загружаются
+    одним запросом по id.
+    """
+
+    def __init__(self, query, queryset=None):
+        self.expression = match_expression(query)
+        self.queryset = Post.objects.feed() if queryset is None else queryset
+
+    def count(self):
+        if not self.expression:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT count(*) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s', [self.expression]
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        if not self.expression or index.stop is not None and (
+                index.stop <= start):
+            return []
+        limit = -1 if index.stop is None else index.stop - start
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, snippet({FTS_TABLE}, 0, %s, %s, %s, %s) '
+                f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                'ORDER BY rank LIMIT %s OFFSET %s',
+                [SNIPPET_START, SNIPPET_END, '…', SNIPPET_TOKENS,
+                 self.expression, limit, start]
+            )
+            rows = cursor.fetchall()
+        posts = self.queryset.in_bulk([pk for pk, _ in rows])
+        results = []
+        for pk, snippet in rows:
+            if pk in posts:
+                post = posts[pk]
+                post.snippet = highlight(snippet)
+                results.append(post)
+        return results
+
+
+def search_posts(query):
+    """Результаты поиска; без FTS5 остаётся поиск через LIKE."""
+    if is_available():
+        return SearchResults(query)
+    return Post.objects.feed().filter(text__icontains=query)
+
+
+def filter_matching(queryset, query):
+    """Сужает `queryset` до записей, найденных в индексе."""
+    expression = match_expression(query)
+    if not expression:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    return queryset.extra(
+        where=[
+            f'"{table}"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)'
+        ],
+        params=[expression],
+    )
@@ -0,0 +1,138 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache, jobs, timeline
+from .models import AuthorStats, Follow, Group, Post, User
+
+
+def invalidate_feeds(post, *group_ids):
+    usernames = User.objects.filter(pk=post.author_id).values_list(
+        'username', flat=True
+    )
+    slugs = Group.objects.filter(
+        pk__in=[group_id for group_id in group_ids if group_id]
+    ).values_list('slug', flat=True)
+    cache.invalidate(
+        'index',
+        *(f'author:{username}' for username in usernames),
+        *(f'group:{slug}' for slug in slugs),
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_saved_state(sender, instance, **kwargs):
+    saved = None
+    if not instance._state.adding:
+        saved = Post.objects.filter(pk=instance.pk).values_list(
+            'group_id', 'image'
+        ).first()
+    instance._saved_group_id, instance._saved_image = saved or (None, '')
+    if instance.image.name != instance._saved_image:
+        # Старые миниатюры к новой картинке не подходят.
+        instance.thumbnails = '{}'
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, **kwargs):
+    if created:
+        AuthorStats.change_posts_count(instance.author_id, 1)
+        if instance.group_id:
+            Group.change_posts_count(instance.group_id, 1)
+        return
+    old_group_id = getattr(instance, '_saved_group_id', None)
+    if old_group_id == instance.group_id:
+        return
+    if old_group_id:
+        Group.change_posts_count(old_group_id, -1)
+    if instance.group_id:
+        Group.change_posts_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    AuthorStats.change_posts_count(instance.author_id, -1)
+    if instance.group_id:
+        Group.change_posts_count(instance.group_id, -1)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, **kwargs):
+    invalidate_feeds(
+        instance,
+        instance.group_id,
+        getattr(instance, '_saved_group_id', None),
+    )
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    invalidate_feeds(instance, instance.group_id)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, created, **kwargs):
+    if created:
+        jobs.fan_out_post.delay(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def queue_thumbnails(sender, instance, **kwargs):
+    if instance.image and instance.image.name != instance._saved_image:
+        jobs.generate_thumbnails.delay(instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def follow_author(sender, instance, created, **kwargs):
+    if created:
+        AuthorStats.change_followers_count(instance.author_id, 1)
+        jobs.backfill_timeline.delay(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def unfollow_author(sender, instance, **kwargs):
+    AuthorStats.change_followers_count(instance.author_id, -1)
+    timeline.forget(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group(sender, instance, **kwargs):
+    cache.invalidate(
+        'index', f'group:{instance.slug}', f'card:group:{instance.pk}'
+    )
+
+
+# Поля автора, которые видны в карточках и лентах.
+AUTHOR_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def changes_author(update_fields):
+    # Вход сохраняет last_login, а пересчёт хеша — password: карточки
+    # от этого не меняются.
+    return update_fields is None or bool(AUTHOR_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=User)
+def remember_saved_username(sender, instance, update_fields=None, **kwargs):
+    instance._saved_username = None
+    if not instance._state.adding and changes_author(update_fields):
+        instance._saved_username = User.objects.filter(
+            pk=instance.pk
+        ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def invalidate_author(sender, instance, update_fields=None, **kwargs):
+    if not changes_author(update_fields):
+        return
+    usernames = {instance.username, getattr(instance, '_saved_username', None)}
+    # Имя автора видно и на страницах групп, где он писал.
+    slugs = Group.objects.filter(posts__author=instance).values_list(
+        'slug', flat=True
+    ).distinct()
+    cache.invalidate(
+        'index',
+        *(f'author:{username}' for username in usernames if username),
+        *(f'group:{slug}' for slug in slugs),
+        f'card:author:{instance.pk}',
+    )
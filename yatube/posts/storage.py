@@ -0,0 +1,18 @@
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище для файлов, названных по хешу содержимого.
+
+    Одинаковое имя означает одинаковое содержимое, поэтому повторная
+    загрузка того же файла не переименовывается с суффиксом, а
+    переиспользует уже сохранённый.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
@@ -0,0 +1,83 @@
+"""Потоковая отрисовка лент.
+
+Страница рендерится один раз без записей: тег `{% feed %}` вместо
+цикла оставляет метку и запоминает себя и контекст. Всё до метки
+(head, шапка, заголовок ленты) уходит клиенту сразу, затем записи
+читаются `.iterator()` порциями по POSTS_STREAM_CHUNK_SIZE и тело
+цикла рендерится для каждой, в конце — остаток страницы. Ни список
+записей страницы, ни весь HTML целиком в памяти не собираются.
+"""
+from itertools import islice
+
+from django.conf import settings
+from django.core.paginator import Page
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+
+from .cache import render_cards
+
+MARKER = '<!--feed-stream-->'
+
+
+def wants_stream(request, page_obj):
+    """Потоковый режим: POSTS_STREAMING или `?stream=1` для запроса.
+
+    Работает только с постраничкой по номеру: у курсорной страницы
+    ссылки «назад/вперёд» известны лишь после чтения записей.
+    """
+    enabled = settings.POSTS_STREAMING or request.GET.get('stream') == '1'
+    return enabled and isinstance(page_obj, Page)
+
+
+class FeedStream:
+    def __init__(self, chunk_size, cards=True):
+        self.chunk_size = chunk_size
+        self.cards = cards
+        self.node = None
+
+    def capture(self, node, context, page):
+        """Запоминает цикл `{% feed %}` вместо его отрисовки."""
+        self.node, self.context, self.page = node, context, page
+        return MARKER
+
+    def chunks(self):
+        if not self.page.paginator.count:
+            with self.context.push(forloop={}):
+                yield self.node.nodelist_empty.render(self.context)
+            return
+        total = self.page.end_index() - self.page.start_index() + 1
+        posts = self.page.object_list.iterator(chunk_size=self.chunk_size)
+        counter = 0
+        while True:
+            chunk = list(islice(posts, self.chunk_size))
+            if not chunk:
+                return
+            if self.cards:
+                render_cards(chunk)
+            parts = []
+            for post in chunk:
+                parts.append(self.node.render_item(
+                    self.context, post, counter, total
+                ))
+                counter += 1
+            yield ''.join(parts)
+
+
+def stream_feed(request, template_name, context, cards=True):
+    """Потоковый ответ; `cards=False` — шаблон не выводит карточки
+    записей, и брать их из кеша не нужно.
+    """
+    stream = FeedStream(settings.POSTS_STREAM_CHUNK_SIZE, cards)
+    html = render_to_string(
+        template_name, {**context, 'feed_stream': stream}, request
+    )
+    if stream.node is None:
+        return StreamingHttpResponse([html])
+    head, tail = html.split(MARKER, 1)
+
+    def content():
+        yield head
+        yield from stream.chunks()
+        yield tail
+
+    return StreamingHttpResponse(content())
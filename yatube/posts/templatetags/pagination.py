@@ -0,0 +1,18 @@
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def page_query(context):
+    """Параметры текущего адреса без `page` и `cursor` для ссылок
+    постранички: поисковый запрос, `per_page` и прочие сохраняются.
+    """
+    request = context.get('request')
+    if request is None:
+        return ''
+    query = request.GET.copy()
+    for name in ('page', 'cursor'):
+        query.pop(name, None)
+    encoded = query.urlencode()
+    return f'{encoded}&' if encoded else ''
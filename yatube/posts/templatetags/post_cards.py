@@ -0,0 +1,72 @@
+from copy import copy
+
+from django import template
+from django.template.defaulttags import ForNode
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from ..cache import CARD_TEMPLATE
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    """Карточка записи: готовая из `render_cards` или отрисованная здесь."""
+    html = getattr(post, 'card_html', None)
+    if html is None:
+        html = render_to_string(CARD_TEMPLATE, {'post': post})
+    return mark_safe(html)
+
+
+class FeedNode(template.Node):
+    def __init__(self, nodelist, loop):
+        self.nodelist = nodelist
+        self.loop = loop
+
+    @property
+    def nodelist_empty(self):
+        return self.loop.nodelist_empty
+
+    def render(self, context):
+        stream = context.get('feed_stream')
+        if stream is None:
+            return self.nodelist.render(context)
+        return ''.join(
+            stream.capture(
+                self, copy(context), self.loop.sequence.resolve(context)
+            ) if node is self.loop else node.render_annotated(context)
+            for node in self.nodelist
+        )
+
+    def render_item(self, context, post, counter, total):
+        """Тело цикла для одной записи, с тем же `forloop`, что у for."""
+        forloop = {
+            'parentloop': context.get('forloop', {}),
+            'counter0': counter,
+            'counter': counter + 1,
+            'revcounter': total - counter,
+            'revcounter0': total - counter - 1,
+            'first': counter == 0,
+            'last': counter == total - 1,
+        }
+        with context.push(forloop=forloop, **{self.loop.loopvars[0]: post}):
+            return self.loop.nodelist_loop.render(context)
+
+
+@register.tag
+def feed(parser, token):
+    """`{% feed %}{% for post in page_obj %}...{% endfor %}{% endfeed %}`.
+
+    Обычно просто выводит содержимое. В потоковом режиме (см.
+    posts/streaming.py) цикл по записям страницы выводится порциями
+    по мере чтения из базы.
+    """
+    nodelist = parser.parse(('endfeed',))
+    parser.delete_first_token()
+    loops = [node for node in nodelist if isinstance(node, ForNode)]
+    if len(loops) != 1 or len(loops[0].loopvars) != 1:
+        raise template.TemplateSyntaxError(
+            "Внутри '{% feed %}' ожидается один '{% for post in ... %}'"
+        )
+    return FeedNode(nodelist, loops[0])
@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class ArchiveCommandsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='archive_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_jsonl(self, name, rows):
+        with open(self.path(name), 'w', encoding='utf-8') as stream:
+            for row in rows:
+                stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+        return self.path(name)
+
+    def test_import_keeps_pub_date_and_counts(self):
+        path = self.write_jsonl('posts.jsonl', [
+            {
+                'text': f'Архивная запись {i}',
+                'pub_date': f'2015-03-0{i + 1}T10:00:00+00:00',
+                'author': 'archive_user',
+                'group': 'test-slug' if i % 2 else '',
+            } for i in range(5)
+        ])
+        call_command(
+            'import_posts', path, '--batch-size', '2', stdout=StringIO()
+        )
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertFalse(
+            Post.objects.exclude(pub_date__year=2015).exists()
+        )
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 2)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.post_author).posts_count, 5
+        )
+        self.assertTrue(
+            Post._meta.get_field('pub_date').auto_now_add
+        )
+
+    def test_corrupt_lines_are_skipped(self):
+        row = {'text': 'Текст', 'pub_date': '2020-01-01T00:00:00',
+               'author': 'archive_user', 'group': ''}
+        path = self.path('posts.jsonl')
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(json.dumps(row) + '\n')
+            stream.write('{"text": "обрыв\n')
+            stream.write('[1, 2]\n')
+            stream.write(json.dumps({**row, 'author': ['x']}) + '\n')
+            stream.write(json.dumps(row) + '\n')
+        out, err = StringIO(), StringIO()
+        call_command(
+            'import_posts', path, '--batch-size', '1', stdout=out, stderr=err
+        )
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertIn('Загружено 2, пропущено 3', out.getvalue())
+        self.assertIn('строка 2', err.getvalue())
+
+    def test_unknown_authors_and_groups(self):
+        rows = [
+            {'text': 'Текст', 'pub_date': '2020-01-01T00:00:00',
+             'author': 'stranger', 'group': 'new-group'},
+        ]
+        path = self.write_jsonl('posts.jsonl', rows)
+        call_command(
+            'import_posts', path, stdout=StringIO(), stderr=StringIO()
+        )
+        self.assertEqual(Post.objects.count(), 0)
+        call_command(
+            'import_posts', path, '--create-authors', '--create-groups',
+            stdout=StringIO()
+        )
+        post = Post.objects.get()
+        self.assertEqual(post.author.username, 'stranger')
+        self.assertEqual(post.group.slug, 'new-group')
+
+    def test_export_and_import_round_trip(self):
+        Post.objects.create(
+            text='Первая, "с кавычками"\nи переносом',
+            author=self.post_author,
+            group=self.group
+        )
+        Post.objects.create(text='Вторая', author=self.post_author)
+        expected = list(Post.objects.order_by('id').values_list(
+            'text', 'pub_date', 'author', 'group'
+        ))
+        for file_format in ('jsonl', 'csv'):
+            with self.subTest(file_format=file_format):
+                path = self.path(f'posts.{file_format}')
+                call_command(
+                    'export_posts', path, '--format', file_format,
+                    stderr=StringIO()
+                )
+                Post.objects.all().delete()
+                call_command(
+                    'import_posts', path, '--format', file_format,
+                    stdout=StringIO()
+                )
+                imported = list(Post.objects.order_by('id').values_list(
+                    'text', 'pub_date', 'author', 'group'
+                ))
+                self.assertEqual(imported, expected)
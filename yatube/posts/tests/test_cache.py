@@ -0,0 +1,191 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import cache as feed_cache
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='cache_user')
+        cls.group = Group.objects.create(
+            title='Первая группа',
+            description='Тестовое описание',
+            slug='first-group'
+        )
+        cls.other_group = Group.objects.create(
+            title='Вторая группа',
+            description='Тестовое описание',
+            slug='second-group'
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+        self.group_url = reverse(
+            'posts:group_posts', kwargs={'slug': self.group.slug}
+        )
+        self.other_group_url = reverse(
+            'posts:group_posts', kwargs={'slug': self.other_group.slug}
+        )
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.guest_client.get(reverse('posts:index'))
+        second = self.guest_client.get(reverse('posts:index'))
+        self.assertEqual(first['X-Feed-Cache'], 'miss')
+        self.assertEqual(second['X-Feed-Cache'], 'hit')
+        self.assertEqual(first.content, second.content)
+
+    def test_new_post_invalidates_only_related_feeds(self):
+        for url in (reverse('posts:index'), self.group_url,
+                    self.other_group_url):
+            self.guest_client.get(url)
+        Post.objects.create(
+            text='Новая запись в группе',
+            author=self.post_author,
+            group=self.group
+        )
+        response = self.guest_client.get(self.group_url)
+        self.assertEqual(response['X-Feed-Cache'], 'miss')
+        self.assertContains(response, 'Новая запись в группе')
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertEqual(response['X-Feed-Cache'], 'miss')
+        response = self.guest_client.get(self.other_group_url)
+        self.assertEqual(response['X-Feed-Cache'], 'hit')
+
+    def test_moving_post_invalidates_both_groups(self):
+        self.guest_client.get(self.group_url)
+        self.guest_client.get(self.other_group_url)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.id}),
+            data={'text': 'Перенесённая запись', 'group': self.other_group.id},
+        )
+        for url in (self.group_url, self.other_group_url):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response['X-Feed-Cache'], 'miss')
+
+    def test_renamed_author_invalidates_profile_and_groups(self):
+        profile_url = reverse(
+            'posts:profile', kwargs={'username': self.post_author.username}
+        )
+        for url in (profile_url, self.group_url, self.other_group_url):
+            self.guest_client.get(url)
+        author = User.objects.get(pk=self.post_author.pk)
+        author.username = 'renamed_user'
+        author.save()
+        self.assertEqual(self.guest_client.get(profile_url).status_code, 404)
+        response = self.guest_client.get(self.group_url)
+        self.assertEqual(response['X-Feed-Cache'], 'miss')
+        response = self.guest_client.get(self.other_group_url)
+        self.assertEqual(response['X-Feed-Cache'], 'hit')
+
+    def test_authorized_users_bypass_cache(self):
+        self.authorized_client.get(reverse('posts:index'))
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertNotIn('X-Feed-Cache', response)
+
+    @override_settings(POSTS_FEED_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertNotIn('X-Feed-Cache', response)
+
+    def test_stats_count_hits_and_misses(self):
+        before = feed_cache.stats()
+        self.guest_client.get(reverse('posts:index'))
+        self.guest_client.get(reverse('posts:index'))
+        after = feed_cache.stats()
+        self.assertEqual(after['hits'] - before['hits'], 1)
+        self.assertEqual(after['misses'] - before['misses'], 1)
+
+    def test_stats_endpoint_is_staff_only(self):
+        response = self.authorized_client.get(reverse('feed_cache_stats'))
+        self.assertEqual(response.status_code, 403)
+        staff = User.objects.create_user(username='cache_staff', is_staff=True)
+        self.authorized_client.force_login(staff)
+        stats = self.authorized_client.get(reverse('feed_cache_stats')).json()
+        self.assertEqual(stats, feed_cache.stats())
+
+
+class PostCardCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='card_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        cls.posts = [
+            Post.objects.create(
+                text=f'Тестовый текст {i}',
+                author=cls.post_author,
+                group=cls.group
+            ) for i in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def test_cards_are_shared_between_feeds(self):
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(response['X-Post-Cards'], 'hits=0, misses=3')
+        response = self.authorized_client.get(
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug})
+        )
+        self.assertEqual(response['X-Post-Cards'], 'hits=3, misses=0')
+        self.assertEqual(
+            response.wsgi_request.post_cards, {'hits': 3, 'misses': 0}
+        )
+
+    def test_edited_post_card_is_rendered_again(self):
+        self.authorized_client.get(reverse('posts:index'))
+        post = self.posts[0]
+        post.text = 'Изменённый текст'
+        post.save()
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(response['X-Post-Cards'], 'hits=2, misses=1')
+        self.assertContains(response, 'Изменённый текст')
+
+    def test_renamed_author_cards_are_rendered_again(self):
+        self.authorized_client.get(reverse('posts:index'))
+        self.post_author.last_login = timezone.now()
+        self.post_author.save(update_fields=['last_login'])
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(response['X-Post-Cards'], 'hits=3, misses=0')
+        self.post_author.first_name = 'Лев'
+        self.post_author.last_name = 'Толстой'
+        self.post_author.save()
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(response['X-Post-Cards'], 'hits=0, misses=3')
+        self.assertContains(response, 'Лев Толстой')
+
+    def test_renamed_group_cards_are_rendered_again(self):
+        self.authorized_client.get(reverse('posts:index'))
+        self.group.title = 'Новое название'
+        self.group.save()
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(response['X-Post-Cards'], 'hits=0, misses=3')
+
+
+@override_settings(CACHES={'default': settings.CACHE_BACKENDS['fakeredis']})
+class RedisFeedCacheTest(FeedCacheTest):
+    """Те же проверки на django-redis с fakeredis вместо сервера."""
@@ -0,0 +1,118 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='etag_user')
+        cls.reader = User.objects.create_user(username='etag_reader')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def revalidate(self, client, path, response):
+        return client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_feeds_answer_not_modified(self):
+        paths = (
+            reverse('posts:index'),
+            reverse('posts:group_posts', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.post_author.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+        for client in (self.guest_client, self.authorized_client):
+            for path in paths:
+                with self.subTest(path=path):
+                    response = client.get(path)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertTrue(response.has_header('Last-Modified'))
+                    again = self.revalidate(client, path, response)
+                    self.assertEqual(again.status_code, 304)
+                    self.assertEqual(again['ETag'], response['ETag'])
+
+    def test_cache_control_depends_on_user(self):
+        path = reverse('posts:index')
+        public = self.guest_client.get(path)['Cache-Control']
+        private = self.authorized_client.get(path)['Cache-Control']
+        self.assertIn('public', public)
+        self.assertIn('max-age=60', public)
+        self.assertIn('private', private)
+        self.assertIn('no-cache', private)
+
+    def test_edited_post_changes_etag(self):
+        path = reverse('posts:index')
+        response = self.guest_client.get(path)
+        self.post.text = 'Новый текст'
+        self.post.save()
+        again = self.revalidate(self.guest_client, path, response)
+        self.assertEqual(again.status_code, 200)
+        self.assertNotEqual(again['ETag'], response['ETag'])
+
+    def test_etag_differs_between_users(self):
+        path = reverse('posts:post_detail', args=[self.post.pk])
+        response = self.authorized_client.get(path)
+        reader_client = Client()
+        reader_client.force_login(self.reader)
+        again = self.revalidate(reader_client, path, response)
+        self.assertEqual(again.status_code, 200)
+
+    def test_follow_changes_profile_etag(self):
+        reader_client = Client()
+        reader_client.force_login(self.reader)
+        path = reverse('posts:profile', args=[self.post_author.username])
+        response = reader_client.get(path)
+        reader_client.get(
+            reverse('posts:profile_follow', args=[self.post_author.username])
+        )
+        again = self.revalidate(reader_client, path, response)
+        self.assertEqual(again.status_code, 200)
+
+    def test_renamed_group_changes_etag(self):
+        paths = (
+            reverse('posts:index'),
+            reverse('posts:group_posts', args=[self.group.slug]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+        responses = [self.authorized_client.get(path) for path in paths]
+        self.group.title = 'Новое название'
+        self.group.save()
+        for path, response in zip(paths, responses):
+            with self.subTest(path=path):
+                again = self.revalidate(self.authorized_client, path, response)
+                self.assertEqual(again.status_code, 200)
+                self.assertContains(again, 'Новое название')
+
+    def test_renamed_author_changes_etag(self):
+        paths = (
+            reverse('posts:index'),
+            reverse('posts:profile', args=[self.post_author.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+        responses = [self.authorized_client.get(path) for path in paths]
+        self.post_author.first_name = 'Новое'
+        self.post_author.save()
+        for path, response in zip(paths, responses):
+            with self.subTest(path=path):
+                again = self.revalidate(self.authorized_client, path, response)
+                self.assertEqual(again.status_code, 200)
@@ -0,0 +1,102 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import AuthorStats, Follow, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='counter_user')
+        cls.group = Group.objects.create(
+            title='Первая группа',
+            description='Тестовое описание',
+            slug='first-group'
+        )
+        cls.other_group = Group.objects.create(
+            title='Вторая группа',
+            description='Тестовое описание',
+            slug='second-group'
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def assertCounts(self, author_count, group_count, other_group_count):
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).posts_count,
+            author_count
+        )
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, group_count)
+        self.assertEqual(self.other_group.posts_count, other_group_count)
+
+    def test_create_edit_and_delete_update_counters(self):
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Новый пост', 'group': self.group.id},
+        )
+        self.assertCounts(1, 1, 0)
+        post = Post.objects.get(text='Новый пост')
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.id}),
+            data={'text': 'Новый пост', 'group': self.other_group.id},
+        )
+        self.assertCounts(1, 0, 1)
+        post.refresh_from_db()
+        post.delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_saving_stale_group_keeps_counter(self):
+        stale = Group.objects.get(pk=self.group.pk)
+        Post.objects.create(text='Запись', author=self.user, group=self.group)
+        stale.title = 'Новое название'
+        stale.save()
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.title, 'Новое название')
+        self.assertEqual(self.group.posts_count, 1)
+
+    def test_bulk_create_updates_counters(self):
+        Post.objects.bulk_create(
+            Post(text=f'Текст {i}', author=self.user, group=self.group)
+            for i in range(5)
+        )
+        self.assertCounts(5, 5, 0)
+
+    def test_views_use_counters(self):
+        Post.objects.create(text='Текст', author=self.user, group=self.group)
+        AuthorStats.objects.filter(author=self.user).update(posts_count=7)
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': self.user.username})
+        )
+        self.assertEqual(response.context['post_count'], 7)
+
+    def test_recount_command_checks_and_fixes(self):
+        Post.objects.create(text='Текст', author=self.user, group=self.group)
+        Group.objects.filter(pk=self.group.pk).update(posts_count=3)
+        AuthorStats.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('recount_posts', '--check')
+        call_command('recount_posts')
+        call_command('recount_posts', '--check')
+        self.assertCounts(1, 1, 0)
+
+    def test_recount_command_fixes_followers(self):
+        reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=reader, author=self.user)
+        AuthorStats.objects.filter(author=self.user).update(
+            followers_count=5
+        )
+        call_command('recount_posts', stdout=StringIO())
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).followers_count, 1
+        )
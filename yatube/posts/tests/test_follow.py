@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Follow, Post, TimelineEntry
+
+User = get_user_model()
+
+
+@override_settings(TASKS_ALWAYS_EAGER=True)
+class FollowTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.stranger = User.objects.create_user(username='stranger')
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.reader)
+
+    def follow(self, author):
+        return self.authorized_client.get(
+            reverse('posts:profile_follow', args=[author.username])
+        )
+
+    def feed(self, cursor=None):
+        data = {'cursor': cursor} if cursor else {}
+        return self.authorized_client.get(
+            reverse('posts:follow_index'), data
+        ).context['page_obj']
+
+    def test_follow_and_unfollow(self):
+        response = self.follow(self.author)
+        self.assertRedirects(
+            response, reverse('posts:profile', args=[self.author.username])
+        )
+        self.follow(self.author)
+        self.assertEqual(Follow.objects.filter(user=self.reader).count(), 1)
+        self.assertEqual(self.author.post_stats.followers_count, 1)
+        self.authorized_client.get(
+            reverse('posts:profile_unfollow', args=[self.author.username])
+        )
+        self.assertFalse(Follow.objects.exists())
+        self.author.post_stats.refresh_from_db()
+        self.assertEqual(self.author.post_stats.followers_count, 0)
+
+    def test_cannot_follow_self(self):
+        self.follow(self.reader)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_post_is_fanned_out_to_followers(self):
+        self.follow(self.author)
+        post = Post.objects.create(text='Новая запись', author=self.author)
+        Post.objects.create(text='Чужая запись', author=self.stranger)
+        self.assertEqual(
+            list(TimelineEntry.objects.values_list('user', 'post')),
+            [(self.reader.pk, post.pk)],
+        )
+        self.assertEqual(list(self.feed()), [post])
+
+    def test_follow_backfills_and_unfollow_clears_timeline(self):
+        post = Post.objects.create(text='Старая запись', author=self.author)
+        self.follow(self.author)
+        self.assertEqual(list(self.feed()), [post])
+        self.authorized_client.get(
+            reverse('posts:profile_unfollow', args=[self.author.username])
+        )
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(list(self.feed()), [])
+
+    @override_settings(POSTS_FANOUT_LIMIT=1)
+    def test_popular_authors_are_merged_on_read(self):
+        Follow.objects.create(user=self.stranger, author=self.author)
+        self.follow(self.author)
+        self.follow(self.stranger)
+        posts = [
+            Post.objects.create(text=f'Запись {i}', author=author)
+            for i in range(6) for author in (self.author, self.stranger)
+        ]
+        self.assertFalse(
+            TimelineEntry.objects.filter(author=self.author).exists()
+        )
+        self.assertEqual(
+            TimelineEntry.objects.filter(author=self.stranger).count(), 6
+        )
+        expected = sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True
+        )
+        with self.assertNumQueries(6):
+            page = self.feed()
+        collected = list(page)
+        while page.has_next():
+            page = self.feed(page.next_cursor)
+            collected.extend(page)
+        self.assertEqual(collected, expected)
+        self.assertEqual(list(self.feed(page.previous_cursor)), expected[:10])
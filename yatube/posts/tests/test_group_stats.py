@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import schedule_periodic
+
+from ..models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.authors = [
+            User.objects.create_user(username=f'author_{i}') for i in range(3)
+        ]
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        cls.empty_group = Group.objects.create(
+            title='Пустая группа',
+            description='Тестовое описание',
+            slug='empty'
+        )
+        for author, count in zip(cls.authors, (1, 3, 2)):
+            for _ in range(count):
+                Post.objects.create(
+                    text='Тестовый текст', author=author, group=cls.group
+                )
+
+    def test_refresh_command_fills_stats(self):
+        call_command('refresh_group_stats', stdout=StringIO())
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(
+            stats.last_post_date,
+            Post.objects.filter(group=self.group).latest('pub_date').pub_date,
+        )
+        self.assertEqual(
+            [author['username'] for author in stats.authors],
+            ['author_1', 'author_2', 'author_0'],
+        )
+        self.assertEqual(stats.authors[0]['posts'], 3)
+        self.assertIsNone(
+            GroupStats.objects.get(group=self.empty_group).last_post_date
+        )
+        call_command('refresh_group_stats', stdout=StringIO())
+        self.assertEqual(GroupStats.objects.count(), 2)
+
+    def test_directory_does_not_aggregate_posts(self):
+        call_command('refresh_group_stats', stdout=StringIO())
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('posts:group_index'))
+        groups = list(response.context['page_obj'])
+        self.assertEqual(groups, [self.group, self.empty_group])
+        self.assertContains(response, 'author_1')
+
+    def test_directory_works_before_first_refresh(self):
+        response = self.client.get(reverse('posts:group_index'))
+        self.assertContains(response, self.empty_group.title)
+
+    @override_settings(
+        TASKS_ALWAYS_EAGER=False,
+        TASKS_PERIODIC={'posts.jobs.refresh_group_stats': 60},
+    )
+    def test_refresh_is_scheduled_periodically(self):
+        refreshes = Task.objects.filter(name='posts.jobs.refresh_group_stats')
+        schedule_periodic()
+        schedule_periodic()
+        task = refreshes.get()
+        call_command(
+            'run_tasks', '--once', '--processes', '0', stdout=StringIO()
+        )
+        self.assertTrue(GroupStats.objects.filter(group=self.group).exists())
+        task.refresh_from_db()
+        following = refreshes.get(status=Task.PENDING)
+        self.assertEqual(
+            following.run_at, task.finished + timedelta(seconds=60)
+        )
+        self.assertGreater(following.run_at, timezone.now())
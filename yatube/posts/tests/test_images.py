@@ -0,0 +1,82 @@
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Post
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, TASKS_ALWAYS_EAGER=True)
+class PostImageTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='image_user')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def create_post(self):
+        image = SimpleUploadedFile(
+            name='small.gif', content=SMALL_GIF, content_type='image/gif'
+        )
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Запись с картинкой', 'image': image},
+        )
+        return Post.objects.get()
+
+    def test_upload_uses_content_hash_and_pregenerates_thumbnails(self):
+        post = self.create_post()
+        self.assertRegex(
+            post.image.name, r'^posts/[0-9a-f]{2}/[0-9a-f]{64}\.gif$'
+        )
+        thumbnails = json.loads(post.thumbnails)
+        self.assertEqual(set(thumbnails), {'feed', 'detail'})
+        self.assertEqual(
+            (thumbnails['feed']['width'], thumbnails['feed']['height']),
+            (960, 339),
+        )
+
+    def test_feed_renders_thumbnails_without_touching_storage(self):
+        post = self.create_post()
+        with mock.patch.object(
+            FileSystemStorage, 'exists', side_effect=AssertionError
+        ), mock.patch.object(
+            FileSystemStorage, 'size', side_effect=AssertionError
+        ):
+            response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, post.thumbs['feed']['url'])
+
+    def test_editing_without_new_image_keeps_thumbnails(self):
+        post = self.create_post()
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=[post.pk]),
+            data={'text': 'Новый текст'},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.text, 'Новый текст')
+        self.assertIn('feed', post.thumbs)
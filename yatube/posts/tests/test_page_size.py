@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+LONG_TEXT = 'начало ' + 'слово ' * 50 + 'конец'
+
+
+@override_settings(POSTS_MAX_PAGE_SIZE=20, POSTS_ARCHIVE_SNIPPET=20)
+class PageSizeTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='size_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        Post.objects.bulk_create(
+            Post(text=LONG_TEXT, author=cls.post_author, group=cls.group)
+            for _ in range(25)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def page_length(self, name, args=(), **params):
+        response = self.guest_client.get(reverse(name, args=args), params)
+        return len(response.context['page_obj'])
+
+    def test_per_page_is_capped(self):
+        self.assertEqual(self.page_length('posts:index'), 10)
+        self.assertEqual(self.page_length('posts:index', per_page=5), 5)
+        self.assertEqual(self.page_length('posts:index', per_page=500), 20)
+        self.assertEqual(self.page_length('posts:index', per_page=0), 1)
+        self.assertEqual(self.page_length('posts:index', per_page='x'), 10)
+
+    @override_settings(POSTS_PAGE_SIZES={'group': 3})
+    def test_page_size_per_view(self):
+        self.assertEqual(
+            self.page_length('posts:group_posts', [self.group.slug]), 3
+        )
+        self.assertEqual(self.page_length('posts:index'), 10)
+
+    def test_pagination_links_keep_per_page(self):
+        response = self.guest_client.get(
+            reverse('posts:index'), {'per_page': 5}
+        )
+        self.assertContains(response, '?per_page=5&amp;page=2')
+
+    def test_archive_streams_snippets(self):
+        for path in (
+            reverse('posts:group_archive', args=[self.group.slug]),
+            reverse('posts:profile_archive', args=[self.post_author]),
+        ):
+            with self.subTest(path=path):
+                response = self.guest_client.get(path)
+                self.assertTrue(response.streaming)
+                html = b''.join(response.streaming_content).decode()
+                self.assertEqual(html.count(LONG_TEXT[:20]), 25)
+                self.assertNotIn('конец', html)
+
+    @override_settings(POSTS_ARCHIVE_MAX_PAGE_SIZE=10)
+    def test_archive_pages_are_capped(self):
+        response = self.guest_client.get(
+            reverse('posts:group_archive', args=[self.group.slug]),
+            {'per_page': 100, 'page': 3},
+        )
+        html = b''.join(response.streaming_content).decode()
+        self.assertEqual(html.count(LONG_TEXT[:20]), 5)
+
+    def test_bench_archive_reports_sizes(self):
+        out = StringIO()
+        call_command('bench_archive', '--sizes', '5,20', stdout=out)
+        self.assertIn('per_page=5 ', out.getvalue())
+        self.assertIn('per_page=20 ', out.getvalue())
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+from ..paginator import CursorPage, CursorPaginator
+
+User = get_user_model()
+POST_COUNT = settings.POSTS_PAGE_SIZE
+
+
+class CursorPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='cursor_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        Post.objects.bulk_create(
+            Post(
+                text=f'Тестовый текст {i}',
+                author=cls.post_author,
+                group=cls.group
+            ) for i in range(23)
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.paginator = CursorPaginator(Post.objects.all(), POST_COUNT)
+
+    def test_pages_walk_whole_feed_in_order(self):
+        expected = list(
+            Post.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True)
+        )
+        seen = []
+        page = self.paginator.get_page()
+        while True:
+            seen.extend(post.id for post in page)
+            if not page.has_next():
+                break
+            page = self.paginator.get_page(page.next_cursor)
+        self.assertEqual(seen, expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        first = self.paginator.get_page()
+        second = self.paginator.get_page(first.next_cursor)
+        back = self.paginator.get_page(second.previous_cursor)
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(first.has_previous())
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_broken_cursor_returns_first_page(self):
+        first = self.paginator.get_page()
+        # Последний — {"v": [{}, 1], "r": 0}: значения курсора не строки.
+        cursors = ('', 'broken', 'eyJ2IjpbXX0', 'eyJ2Ijpbe30sMV0sInIiOjB9')
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                page = self.paginator.get_page(cursor)
+                self.assertEqual(list(page), list(first))
+
+    def test_cursor_mode_does_not_count(self):
+        with self.assertNumQueries(1):
+            page = self.paginator.get_page()
+            self.assertEqual(len(page), POST_COUNT)
+
+    def test_views_switch_to_cursor_mode(self):
+        paths = [
+            reverse('posts:index'),
+            reverse('posts:group_posts', kwargs={'slug': self.group.slug}),
+            reverse(
+                'posts:profile',
+                kwargs={'username': self.post_author.username}
+            ),
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                response = self.guest_client.get(path, {'cursor': ''})
+                page_obj = response.context['page_obj']
+                self.assertIsInstance(page_obj, CursorPage)
+                self.assertEqual(len(page_obj), POST_COUNT)
+                self.assertContains(
+                    response, f'?cursor={page_obj.next_cursor}'
+                )
+
+    @override_settings(POSTS_PAGINATION='cursor')
+    def test_setting_enables_cursor_mode(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertIsInstance(response.context['page_obj'], CursorPage)
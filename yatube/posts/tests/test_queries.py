@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import urls
+from ..models import Group, Post
+
+User = get_user_model()
+
+# Верхняя граница запросов к БД на любую страницу из posts.views,
+# включая сессию и пользователя авторизованного клиента.
+QUERY_BUDGET = 6
+# Эти адреса отвечают редиректом, а не страницей.
+REDIRECTS = {'profile_follow', 'profile_unfollow'}
+
+
+class ViewQueryBudgetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(
+            username='budget_user', first_name='Имя', last_name='Фамилия'
+        )
+        cls.groups = [
+            Group.objects.create(
+                title=f'Группа {i}',
+                description='Тестовое описание',
+                slug=f'group-{i}'
+            ) for i in range(3)
+        ]
+        Post.objects.bulk_create(
+            Post(
+                text=f'Тестовый текст {i}',
+                author=User.objects.create_user(
+                    username=f'author_{i}', first_name=f'Автор {i}'
+                ),
+                group=cls.groups[i % len(cls.groups)],
+            ) for i in range(30)
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.groups[0],
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def url_kwargs(self, pattern):
+        values = {
+            'slug': self.groups[0].slug,
+            'username': self.post_author.username,
+            'post_id': self.post.id,
+        }
+        return {
+            name: values[name]
+            for name in pattern.pattern.regex.groupindex
+        }
+
+    def count_queries(self, path, per_page, status=200):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.get(
+                path, {'per_page': per_page}
+            )
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, status)
+        return len(queries)
+
+    def test_views_stay_within_query_budget(self):
+        for pattern in urls.urlpatterns:
+            path = reverse(
+                f'posts:{pattern.name}', kwargs=self.url_kwargs(pattern)
+            )
+            status = 302 if pattern.name in REDIRECTS else 200
+            with self.subTest(path=path):
+                small = self.count_queries(path, per_page=1, status=status)
+                large = self.count_queries(path, per_page=30, status=status)
+                self.assertLessEqual(large, QUERY_BUDGET)
+                self.assertEqual(small, large)
@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import search
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='search_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        cls.post = Post.objects.create(
+            text='Котики захватили главную страницу',
+            author=cls.post_author,
+            group=cls.group
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Про собак <b>{i}</b>', author=cls.post_author)
+            for i in range(12)
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_search_page_finds_post_with_snippet(self):
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': 'котики'}
+        )
+        page_obj = response.context['page_obj']
+        self.assertEqual(list(page_obj), [self.post])
+        self.assertContains(response, '<mark>Котики</mark>')
+
+    def test_snippet_is_escaped(self):
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': 'собак'}
+        )
+        self.assertContains(response, '&lt;b&gt;')
+        self.assertNotContains(response, '<b>')
+
+    def test_search_is_paginated_and_keeps_query(self):
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': 'собак', 'page': 2}
+        )
+        self.assertEqual(response.context['page_obj'].paginator.count, 12)
+        self.assertEqual(len(response.context['page_obj']), 2)
+        self.assertContains(response, '?q=%D1%81%D0%BE%D0%B1%D0%B0%D0%BA&')
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.create(
+            text='Редкое слово', author=self.post_author
+        )
+        self.assertEqual(search.SearchResults('редкое').count(), 1)
+        Post.objects.filter(pk=post.pk).update(text='Другое слово')
+        self.assertEqual(search.SearchResults('редкое').count(), 0)
+        self.assertEqual(search.SearchResults('другое').count(), 1)
+        post.delete()
+        self.assertEqual(search.SearchResults('другое').count(), 0)
+
+    def test_query_syntax_is_not_interpreted(self):
+        for query in ('"', 'NEAR(', '*', 'котики OR -собак'):
+            with self.subTest(query=query):
+                response = self.guest_client.get(
+                    reverse('posts:search'), {'q': query}
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_admin_search_uses_index(self):
+        found = search.filter_matching(Post.objects.all(), 'главную')
+        self.assertEqual(list(found), [self.post])
+        found = search.filter_matching(Post.objects.all(), 'собак')
+        self.assertEqual(found.count(), 12)
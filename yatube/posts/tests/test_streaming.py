@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+@override_settings(POSTS_STREAM_CHUNK_SIZE=3)
+class StreamingFeedTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create_user(username='stream_user')
+        cls.group = Group.objects.create(
+            title='Тестовый заголовок',
+            description='Тестовое описание',
+            slug='test-slug'
+        )
+        cls.empty_group = Group.objects.create(
+            title='Пустая группа',
+            description='Тестовое описание',
+            slug='empty'
+        )
+        Post.objects.bulk_create(
+            Post(
+                text=f'Запись номер {i}',
+                author=cls.post_author,
+                group=cls.group,
+            ) for i in range(12)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def test_stream_matches_regular_render(self):
+        paths = (
+            reverse('posts:index'),
+            reverse('posts:group_posts', args=[self.group.slug]),
+            reverse('posts:group_posts', args=[self.empty_group.slug]),
+            reverse('posts:profile', args=[self.post_author.username]),
+        )
+        for client in (self.guest_client, self.authorized_client):
+            for path in paths:
+                with self.subTest(path=path):
+                    with self.settings(POSTS_STREAMING=True):
+                        streamed = client.get(path, {'page': 2})
+                    regular = client.get(path, {'page': 2})
+                    self.assertTrue(streamed.streaming)
+                    self.assertEqual(
+                        b''.join(streamed.streaming_content),
+                        regular.content,
+                    )
+
+    def test_head_is_sent_before_posts(self):
+        response = self.guest_client.get(
+            reverse('posts:index'), {'stream': 1}
+        )
+        parts = [part.decode() for part in response.streaming_content]
+        self.assertEqual(len(parts), 1 + 4 + 1)
+        self.assertIn('Главная страница', parts[0])
+        self.assertNotIn('Запись номер', parts[0])
+        self.assertEqual(parts[1].count('Запись номер'), 3)
+        self.assertNotIn('ETag', response)
+
+    @override_settings(POSTS_STREAMING=True)
+    def test_cursor_pages_are_not_streamed(self):
+        response = self.guest_client.get(
+            reverse('posts:index'), {'cursor': ''}
+        )
+        self.assertFalse(response.streaming)
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertTrue(response.streaming)
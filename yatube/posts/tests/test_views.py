@@ -1,12 +1,13 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.urls import reverse
 
 from ..forms import PostForm
 from ..models import Post, Group
-from ..views import POST_COUNT
 
 User = get_user_model()
+POST_COUNT = settings.POSTS_PAGE_SIZE
 
 
 class PostsPagesTests(TestCase):
@@ -0,0 +1,46 @@
+"""Миниатюры картинок записей, которые готовятся заранее.
+
+sorl.thumbnail умеет делать миниатюры лениво, при первой отрисовке
+`{% thumbnail %}`, но тогда первый же просмотр ленты платит за
+обработку картинки, а каждый следующий — за обращение к хранилищу
+ключей. Здесь миниатюры всех размеров делаются воркером сразу после
+загрузки, а их адреса и размеры сохраняются в `Post.thumbnails`:
+лента берёт их из строки записи, не трогая файловую систему.
+"""
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from sorl.thumbnail import get_thumbnail
+
+from .models import Post
+
+
+def generate(post):
+    """Делает миниатюры всех размеров и возвращает их описание."""
+    thumbnails = {}
+    for size, (geometry, options) in settings.POSTS_THUMBNAIL_SIZES.items():
+        thumbnail = get_thumbnail(post.image, geometry, **options)
+        thumbnails[size] = {
+            'url': thumbnail.url,
+            'width': thumbnail.width,
+            'height': thumbnail.height,
+        }
+    return thumbnails
+
+
+def refresh(post_id):
+    """Пересобирает миниатюры записи и сбрасывает кеш её карточек."""
+    post = Post.objects.filter(pk=post_id).only(
+        'author_id', 'group_id', 'image'
+    ).first()
+    if post is None or not post.image:
+        return
+    thumbnails = json.dumps(generate(post), sort_keys=True)
+    # Через update(), чтобы не запускать сигналы сохранения; `updated`
+    # меняется вручную, иначе карточка осталась бы в кеше без картинки.
+    Post.objects.filter(pk=post_id, image=post.image.name).update(
+        thumbnails=thumbnails, updated=timezone.now()
+    )
+    from .signals import invalidate_feeds
+    invalidate_feeds(post, post.group_id)
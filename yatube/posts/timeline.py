@@ -0,0 +1,122 @@
+"""Лента подписок: раскладка при записи и склейка при чтении.
+
+Записи автора раскладываются по готовым лентам подписчиков
+(`TimelineEntry`), пока подписчиков не больше POSTS_FANOUT_LIMIT.
+У более популярных авторов раскладка обошлась бы в тысячи строк на
+каждую запись, поэтому их записи подмешиваются в ленту при чтении.
+"""
+from django.conf import settings
+
+from .models import AuthorStats, Follow, Post, TimelineEntry
+from .paginator import (
+    CursorPage, InvalidCursor, decode_cursor, encode_cursor, seek
+)
+
+FIELDS = ('pub_date', 'id')
+
+
+def is_popular(author_id):
+    followers = AuthorStats.objects.filter(author_id=author_id).values_list(
+        'followers_count', flat=True
+    ).first()
+    return (followers or 0) > settings.POSTS_FANOUT_LIMIT
+
+
+def fan_out(post):
+    """Кладёт новую запись в ленты подписчиков автора."""
+    if is_popular(post.author_id):
+        return 0
+    followers = Follow.objects.filter(author_id=post.author_id).values_list(
+        'user_id', flat=True
+    )
+    entries = TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(
+                user_id=user_id,
+                post_id=post.pk,
+                author_id=post.author_id,
+                pub_date=post.pub_date,
+            ) for user_id in followers.iterator()
+        ),
+        batch_size=settings.POSTS_FANOUT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(entries)
+
+
+def backfill(user_id, author_id):
+    """Переносит в ленту нового подписчика последние записи автора."""
+    if is_popular(author_id):
+        return
+    posts = Post.objects.filter(author_id=author_id).values_list(
+        'id', 'pub_date'
+    )[:settings.POSTS_TIMELINE_BACKFILL]
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(
+                user_id=user_id,
+                post_id=post_id,
+                author_id=author_id,
+                pub_date=pub_date,
+            ) for post_id, pub_date in posts
+        ),
+        ignore_conflicts=True,
+    )
+
+
+def forget(user_id, author_id):
+    TimelineEntry.objects.filter(user_id=user_id, author_id=author_id).delete()
+
+
+class TimelinePaginator:
+    """Курсорная пагинация ленты подписок.
+
+    Курсор тот же, что у `CursorPaginator`: `(pub_date, id)` записи.
+    Готовая лента и записи популярных авторов читаются по нему
+    независимо, а страница собирается слиянием двух кусков.
+    """
+
+    def __init__(self, user, per_page):
+        self.user = user
+        self.per_page = int(per_page)
+
+    def cursor_for(self, obj, reverse=False):
+        return encode_cursor([getattr(obj, name) for name in FIELDS], reverse)
+
+    def get_page(self, cursor=None):
+        try:
+            values, reverse = decode_cursor(cursor, Post, FIELDS)
+        except InvalidCursor:
+            values, reverse = None, False
+        direction = '' if reverse else '-'
+        limit = self.per_page + 1
+        popular = list(
+            Follow.objects.filter(
+                user=self.user,
+                author__post_stats__followers_count__gt=(
+                    settings.POSTS_FANOUT_LIMIT
+                ),
+            ).values_list('author_id', flat=True)
+        )
+        entries = TimelineEntry.objects.filter(user=self.user).exclude(
+            author_id__in=popular
+        ).order_by(f'{direction}pub_date', f'{direction}post_id')
+        if values is not None:
+            entries = seek(entries, ('pub_date', 'post_id'), values, reverse)
+        keys = list(entries.values_list('pub_date', 'post_id')[:limit])
+        if popular:
+            posts = Post.objects.filter(author_id__in=popular).order_by(
+                *(f'{direction}{name}' for name in FIELDS)
+            )
+            if values is not None:
+                posts = seek(posts, FIELDS, values, reverse)
+            keys.extend(posts.values_list(*FIELDS)[:limit])
+        keys.sort(reverse=not reverse)
+        has_more = len(keys) > self.per_page
+        ids = [post_id for _, post_id in keys[:self.per_page]]
+        found = Post.objects.feed().in_bulk(ids)
+        rows = [found[post_id] for post_id in ids if post_id in found]
+        if reverse:
+            rows.reverse()
+            return CursorPage(rows, self, True, has_more)
+        return CursorPage(rows, self, has_more, values is not None)
@@ -0,0 +1,150 @@
+import hashlib
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models.functions import Substr
+from django.shortcuts import render
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+
+from .cache import card_scopes, render_cards, scope_versions
+from .paginator import CursorPaginator
+from .streaming import stream_feed, wants_stream
+
+
+def page_size(request, view, limit=None):
+    """Размер страницы для `view`: `?per_page=`, но не больше `limit`
+    (по умолчанию POSTS_MAX_PAGE_SIZE), иначе из POSTS_PAGE_SIZES.
+    """
+    default = settings.POSTS_PAGE_SIZES.get(view, settings.POSTS_PAGE_SIZE)
+    try:
+        size = int(request.GET['per_page'])
+    except (KeyError, ValueError):
+        return default
+    return min(max(size, 1), limit or settings.POSTS_MAX_PAGE_SIZE)
+
+
+def get_page(request, posts, per_page, count=None):
+    """Страница ленты: по номеру (`?page=`) или по курсору (`?cursor=`).
+
+    Если число записей уже известно из счётчика, `count` избавляет
+    постраничку от лишнего COUNT(*).
+    """
+    if settings.POSTS_PAGINATION == 'cursor' or 'cursor' in request.GET:
+        paginator = CursorPaginator(posts, per_page)
+        return paginator.get_page(request.GET.get('cursor'))
+    paginator = Paginator(posts, per_page)
+    if count is not None:
+        paginator.count = count
+    return paginator.get_page(request.GET.get('page'))
+
+
+def validators(request, posts, *extra, scopes=()):
+    """ETag и Last-Modified страницы по её записям, без отрисовки.
+
+    Страница меняется, только если поменялся состав записей или
+    какая-то из них (`updated`), переименовали их автора или группу
+    (метки версий карточек), либо сменился посетитель: для него
+    по-другому выглядят шапка и кнопки. `scopes` — метки самой страницы
+    (её группа или автор), `extra` — прочее её состояние, например
+    подписка на автора.
+    """
+    posts = list(posts)
+    versions = scope_versions([
+        *scopes, *(scope for post in posts for scope in card_scopes(post))
+    ])
+    digest = hashlib.md5()
+    user_id = request.user.pk if request.user.is_authenticated else ''
+    digest.update(f'{user_id}|{extra!r}|{sorted(versions.items())}'.encode())
+    last_modified = None
+    for post in posts:
+        digest.update(f'|{post.pk}:{post.updated.timestamp()}'.encode())
+        if last_modified is None or post.updated > last_modified:
+            last_modified = post.updated
+    if last_modified is not None:
+        last_modified = int(last_modified.timestamp())
+    return quote_etag(digest.hexdigest()), last_modified
+
+
+def set_cache_headers(request, response, etag=None, last_modified=None):
+    """Заголовки для браузеров и прокси.
+
+    Анонимные страницы одинаковы для всех и могут храниться в общих
+    кешах POSTS_HTTP_MAX_AGE секунд; страницы вошедших пользователей —
+    только в браузере и с проверкой по ETag при каждом заходе.
+    """
+    if etag is not None:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.POSTS_HTTP_MAX_AGE
+        )
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def render_conditional(request, template_name, context, posts, *extra,
+                       scopes=()):
+    """`render` с ответом 304, если страница у клиента не устарела."""
+    etag, last_modified = validators(request, posts, *extra, scopes=scopes)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = render(request, template_name, context)
+    return set_cache_headers(request, response, etag, last_modified)
+
+
+def render_feed(request, template_name, context, *extra, scopes=()):
+    """Отрисовывает ленту, беря карточки записей из кеша фрагментов.
+
+    Если у клиента свежая копия страницы, отвечает 304, не трогая
+    ни кеш карточек, ни шаблоны. В потоковом режиме записи ещё не
+    прочитаны, поэтому ETag нет и ответ всегда полный.
+    """
+    page_obj = context['page_obj']
+    if wants_stream(request, page_obj):
+        return set_cache_headers(
+            request, stream_feed(request, template_name, context)
+        )
+    total = getattr(page_obj.paginator, 'count', None)
+    etag, last_modified = validators(
+        request, page_obj, total, *extra, scopes=scopes
+    )
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        hits, misses = render_cards(page_obj)
+        request.post_cards = {'hits': hits, 'misses': misses}
+        response = render(request, template_name, context)
+        response['X-Post-Cards'] = f'hits={hits}, misses={misses}'
+    return set_cache_headers(request, response, etag, last_modified)
+
+
+def render_archive(request, posts, count, context):
+    """Архив группы или автора: сотни записей на странице.
+
+    Полный текст записей не читается, вместо него берётся начало в
+    POSTS_ARCHIVE_SNIPPET символов; записи читаются порциями и сразу
+    уходят клиенту, так что память не растёт с размером страницы.
+    """
+    posts = posts.select_related('author').only(
+        'pub_date', 'updated', 'group', 'author__username'
+    ).annotate(snippet=Substr('text', 1, settings.POSTS_ARCHIVE_SNIPPET))
+    paginator = Paginator(posts, page_size(
+        request, 'archive', settings.POSTS_ARCHIVE_MAX_PAGE_SIZE
+    ))
+    paginator.count = count
+    context = {
+        **context, 'page_obj': paginator.get_page(request.GET.get('page'))
+    }
+    return set_cache_headers(request, stream_feed(
+        request, 'posts/archive.html', context, cards=False
+    ))
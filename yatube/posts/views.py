@@ -1,96 +1,205 @@
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator
+from django.db import transaction
+from django.shortcuts import render, get_object_or_404, redirect
 
+from core.ratelimit import ratelimit
+
+from .cache import cache_feed
 from .forms import PostForm
-from .models import Post, Group, User
+from .models import AuthorStats, Follow, Post, Group, User
+from .search import search_posts
+from .timeline import TimelinePaginator
+from .utils import (
+    get_page, page_size, render_archive, render_conditional, render_feed
+)
 
 
-POST_COUNT = 10
+GROUP_COUNT = 50
 
 
+@cache_feed('index')
 def index(request):
-    posts = Post.objects.all()
-    paginator = Paginator(posts, POST_COUNT)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    posts = Post.objects.feed()
+    page_obj = get_page(request, posts, page_size(request, 'index'))
     context = {
         'text': 'Это главная страница проекта Yatube',
         'page_obj': page_obj
     }
-    return render(request, 'posts/index.html', context)
+    return render_feed(request, 'posts/index.html', context)
 
 
+@cache_feed('group', 'slug')
 def group_posts(request, slug):
     """Здесь будет информация о группах проекта Yatube."""
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    paginator = Paginator(posts, POST_COUNT)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    posts = group.posts.feed()
+    page_obj = get_page(
+        request, posts, page_size(request, 'group'), group.posts_count
+    )
     context = {
         'text': 'Здесь будет информация о группах проекта Yatube',
         'group': group,
         'page_obj': page_obj
     }
-    return render(request, 'posts/group_list.html', context)
+    return render_feed(
+        request, 'posts/group_list.html', context,
+        scopes=[f'card:group:{group.pk}'],
+    )
+
+
+def group_archive(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    context = {'title': f'Архив группы {group}', 'group': group}
+    return render_archive(
+        request, group.posts.all(), group.posts_count, context
+    )
 
 
+def group_index(request):
+    """Каталог групп по готовой сводке `GroupStats`."""
+    groups = Group.objects.select_related('stats').order_by(
+        '-posts_count', 'title'
+    )
+    page_obj = Paginator(groups, GROUP_COUNT).get_page(
+        request.GET.get('page')
+    )
+    return render(request, 'posts/group_index.html', {'page_obj': page_obj})
+
+
+@cache_feed('author', 'username')
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    paginator = Paginator(posts, POST_COUNT)
+    author = get_object_or_404(
+        User.objects.select_related('post_stats'), username=username
+    )
+    post_count = AuthorStats.posts_count_for(author)
+    posts = author.posts.feed()
+    page_obj = get_page(
+        request, posts, page_size(request, 'profile'), post_count
+    )
     page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    post_count = author.posts.count()
+    following = request.user.is_authenticated and Follow.objects.filter(
+        user=request.user, author=author
+    ).exists()
     context = {
         'author': author,
         'page_obj': page_obj,
         'page_number': page_number,
-        'post_count': post_count
+        'post_count': post_count,
+        'following': following,
+    }
+    return render_feed(
+        request, 'posts/profile.html', context, following,
+        scopes=[f'card:author:{author.pk}'],
+    )
+
+
+def profile_archive(request, username):
+    author = get_object_or_404(
+        User.objects.select_related('post_stats'), username=username
+    )
+    context = {'title': f'Архив записей {author}', 'author': author}
+    return render_archive(
+        request, author.posts.all(), AuthorStats.posts_count_for(author),
+        context
+    )
 
+
+@login_required
+def follow_index(request):
+    """Лента записей авторов, на которых подписан пользователь."""
+    paginator = TimelinePaginator(
+        request.user, page_size(request, 'follow')
+    )
+    page_obj = paginator.get_page(request.GET.get('cursor'))
+    context = {
+        'page_obj': page_obj,
+    }
+    return render_feed(request, 'posts/follow.html', context)
+
+
+@login_required
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        Follow.objects.get_or_create(user=request.user, author=author)
+    return redirect('posts:profile', username)
+
+
+@login_required
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    follow = Follow.objects.filter(user=request.user, author=author).first()
+    if follow is not None:
+        follow.delete()
+    return redirect('posts:profile', username)
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    posts = search_posts(query) if query else Post.objects.none()
+    page_obj = Paginator(posts, page_size(request, 'search')).get_page(
+        request.GET.get('page')
+    )
+    context = {
+        'query': query,
+        'page_obj': page_obj,
     }
-    return render(request, 'posts/profile.html', context)
+    return render_feed(request, 'posts/search.html', context)
 
 
 def post_detail(request, post_id):
-    posts = get_object_or_404(Post, pk=post_id)
+    posts = get_object_or_404(
+        Post.objects.select_related('author__post_stats', 'group'),
+        pk=post_id
+    )
     author = posts.author
     pub_date = posts.pub_date
-    post_count = author.posts.count()
+    post_count = AuthorStats.posts_count_for(author)
     context = {
         'posts': posts,
         'author': author,
         'pub_date': pub_date,
         'post_count': post_count
     }
-    return render(request, 'posts/post_detail.html', context)
+    # Метки автора и группы записи validators берёт из её карточки.
+    return render_conditional(
+        request, 'posts/post_detail.html', context, [posts], post_count
+    )
 
 
 @login_required
+@ratelimit('post_create')
 def post_create(request):
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
-        post = form.save(commit=False)
-        post.author = request.user
-        post.save()
+        with transaction.atomic():
+            post = form.save(commit=False)
+            post.author = request.user
+            post.save()
         return redirect('posts:profile', request.user)
     return render(request, 'posts/post_create.html', {'form': form})
 
 
 @login_required
+@ratelimit('post_edit')
 def post_edit(request, post_id):
     posts = get_object_or_404(Post, id=post_id)
     is_edit = True
     if posts.author != request.user:
         return redirect('posts:post_detail', post_id)
-    form = PostForm(request.POST or None, instance=posts)
+    form = PostForm(
+        request.POST or None,
+        files=request.FILES or None,
+        instance=posts
+    )
     context = {
         'form': form,
         'posts': posts,
         'is_edit': is_edit
     }
     if form.is_valid():
-        form.save()
+        with transaction.atomic():
+            form.save()
         return redirect('posts:post_detail', post_id)
     return render(request, 'posts/post_create.html', context)
@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tasks.queue import (
+    claim, execute, execute_in_worker, finish, init_worker, schedule_periodic
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Воркер очереди задач: забирает готовые задачи из таблицы и '
+        'выполняет их в пуле процессов, неудачные повторяет с растущей '
+        'паузой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.TASKS_PROCESSES,
+            help='Размер пула; 0 — выполнять в этом же процессе.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=50,
+            help='Сколько задач забирать за раз.',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти.',
+        )
+
+    def handle(self, *args, **options):
+        self.done = self.failed = 0
+        if not options['processes']:
+            self.loop(None, options)
+        else:
+            # Дочерние процессы не должны унаследовать открытые
+            # соединения с базой.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options['processes'], initializer=init_worker
+            ) as pool:
+                self.loop(pool, options)
+        self.stdout.write(
+            f'Выполнено задач: {self.done}, с ошибкой: {self.failed}'
+        )
+
+    def loop(self, pool, options):
+        while True:
+            schedule_periodic()
+            tasks = claim(options['batch_size'])
+            if tasks:
+                self.run(pool, tasks)
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['sleep'])
+
+    def run(self, pool, tasks):
+        if pool is None:
+            errors = [execute(task.name, task.arguments) for task in tasks]
+        else:
+            errors = pool.map(
+                execute_in_worker,
+                [task.name for task in tasks],
+                [task.arguments for task in tasks],
+            )
+        for task, error in zip(tasks, errors):
+            finish(task, error)
+            if error is None:
+                self.done += 1
+            else:
+                self.failed += 1
+                self.stderr.write(
+                    f'{task}: попытка {task.attempts}\n{error}'
+                )
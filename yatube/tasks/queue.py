@@ -0,0 +1,183 @@
+"""Очередь фоновых задач поверх таблицы `Task`.
+
+Задача — обычная функция, отмеченная декоратором `task`; её вызов
+откладывается через `.delay(...)`. Строка задачи пишется в той же
+транзакции, что и данные, которые её породили, поэтому воркер не
+увидит задачу к откатившейся записи. Аргументы должны сериализоваться
+в JSON.
+"""
+import json
+import traceback
+from datetime import timedelta
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .models import Task
+
+REGISTRY = {}
+
+
+def task(func=None, *, name=None, max_attempts=None, unique=False):
+    """Регистрирует функцию как задачу и добавляет ей метод `delay`.
+
+    С `unique=True` задача не ставится повторно, пока в очереди уже
+    ждёт такая же с теми же аргументами.
+    """
+    def register(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        REGISTRY[task_name] = func
+
+        def delay(*args, **kwargs):
+            return enqueue(
+                task_name, *args, max_attempts=max_attempts,
+                unique=unique, **kwargs
+            )
+
+        func.task_name = task_name
+        func.delay = delay
+        return func
+
+    if func is not None:
+        return register(func)
+    return register
+
+
+def enqueue(name, *args, run_at=None, max_attempts=None, unique=False,
+            **kwargs):
+    """Ставит задачу в очередь; с TASKS_ALWAYS_EAGER выполняет сразу."""
+    if name not in REGISTRY:
+        raise KeyError(f'Неизвестная задача {name!r}')
+    if settings.TASKS_ALWAYS_EAGER:
+        REGISTRY[name](*args, **kwargs)
+        return None
+    arguments = json.dumps({'args': args, 'kwargs': kwargs})
+    if unique:
+        waiting = Task.objects.filter(
+            name=name, arguments=arguments, status=Task.PENDING
+        ).first()
+        if waiting is not None:
+            return waiting
+    return Task.objects.create(
+        name=name,
+        arguments=arguments,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS,
+    )
+
+
+def schedule_periodic():
+    """Ставит в очередь задачи из TASKS_PERIODIC, когда подошёл срок.
+
+    Следующий запуск назначается через интервал после окончания
+    предыдущего; пока задача ждёт или выполняется, вторая копия не
+    ставится.
+    """
+    for name, interval in settings.TASKS_PERIODIC.items():
+        runs = Task.objects.filter(name=name)
+        if runs.filter(status__in=(Task.PENDING, Task.RUNNING)).exists():
+            continue
+        last = runs.exclude(finished=None).order_by('-finished').values_list(
+            'finished', flat=True
+        ).first()
+        Task.objects.create(
+            name=name,
+            arguments=json.dumps({'args': [], 'kwargs': {}}),
+            run_at=(
+                last + timedelta(seconds=interval) if last
+                else timezone.now()
+            ),
+            max_attempts=settings.TASKS_MAX_ATTEMPTS,
+        )
+
+
+def retry_delay(attempts):
+    """Экспоненциальная пауза перед повтором, не больше TASKS_RETRY_MAX."""
+    return min(
+        settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.TASKS_RETRY_MAX,
+    )
+
+
+def claim(limit):
+    """Забирает до `limit` готовых задач, помечая их выполняемыми.
+
+    Каждая строка переводится в `running` отдельным UPDATE с условием
+    на прежнее состояние, так что два воркера не возьмут одну задачу
+    и без SELECT ... FOR UPDATE, которого нет в SQLite. Задачи,
+    зависшие в `running` дольше TASKS_LEASE секунд (упавший воркер),
+    снова считаются свободными.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS_LEASE)
+    ready = Task.objects.filter(status=Task.PENDING, run_at__lte=now)
+    expired = Task.objects.filter(status=Task.RUNNING, locked_at__lt=stale)
+    claimed = []
+    for candidate in (ready | expired).values_list('id', 'status')[:limit]:
+        task_id, status = candidate
+        taken = Task.objects.filter(pk=task_id, status=status)
+        if status == Task.RUNNING:
+            taken = taken.filter(locked_at__lt=stale)
+        if taken.update(status=Task.RUNNING, locked_at=now):
+            claimed.append(task_id)
+    return list(Task.objects.filter(pk__in=claimed))
+
+
+def execute(name, arguments):
+    """Выполняет задачу и возвращает текст ошибки или None.
+
+    Вызывается и в дочернем процессе пула, поэтому принимает только
+    простые значения, а не строку `Task`.
+    """
+    try:
+        payload = json.loads(arguments)
+        REGISTRY[name](*payload['args'], **payload['kwargs'])
+    except Exception:
+        return traceback.format_exc()
+    return None
+
+
+def execute_in_worker(name, arguments):
+    """`execute` для пула: процесс живёт долго, соединение не держим."""
+    try:
+        return execute(name, arguments)
+    finally:
+        connections.close_all()
+
+
+def finish(task, error):
+    task.attempts += 1
+    task.locked_at = None
+    task.last_error = error or ''
+    if error is None:
+        task.status = Task.DONE
+        task.finished = timezone.now()
+    elif task.attempts >= task.max_attempts:
+        task.status = Task.FAILED
+        task.finished = timezone.now()
+    else:
+        task.status = Task.PENDING
+        task.run_at = timezone.now() + timedelta(
+            seconds=retry_delay(task.attempts)
+        )
+    task.save(update_fields=[
+        'attempts', 'locked_at', 'last_error', 'status', 'finished',
+        'run_at',
+    ])
+
+
+def init_worker():
+    """Инициализатор процессов пула.
+
+    При fork процесс наследует соединения родителя с базой; ими нельзя
+    пользоваться из двух процессов, поэтому ссылки на них сбрасываются
+    без закрытия, чтобы не оборвать соединение родителя. При spawn
+    Django в дочернем процессе ещё не настроен.
+    """
+    if not apps.ready:
+        django.setup()
+    for connection in connections.all():
+        connection.connection = None
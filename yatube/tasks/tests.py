@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from posts.models import Follow, Post, TimelineEntry
+
+from .models import Task
+from .queue import claim, task
+
+User = get_user_model()
+CALLS = []
+
+
+@task(name='tests.flaky', max_attempts=3)
+def flaky(value):
+    CALLS.append(value)
+    raise RuntimeError('сбой')
+
+
+@override_settings(
+    TASKS_ALWAYS_EAGER=False, TASKS_RETRY_DELAY=10, TASKS_PERIODIC={}
+)
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def run_worker(self):
+        call_command(
+            'run_tasks', '--once', '--processes', '0',
+            stdout=StringIO(), stderr=StringIO(),
+        )
+
+    def test_post_side_effects_are_enqueued(self):
+        reader = User.objects.create_user(username='reader')
+        author = User.objects.create_user(username='author')
+        Follow.objects.create(user=reader, author=author)
+        post = Post.objects.create(text='Текст', author=author)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(
+            Task.objects.filter(status=Task.PENDING).count(), 2
+        )
+        self.run_worker()
+        self.assertEqual(
+            list(TimelineEntry.objects.values_list('user', 'post')),
+            [(reader.pk, post.pk)],
+        )
+        self.assertEqual(Task.objects.filter(status=Task.DONE).count(), 2)
+
+    def test_failed_task_is_retried_with_backoff(self):
+        flaky.delay(1)
+        self.run_worker()
+        job = Task.objects.get()
+        self.assertEqual(
+            (job.status, job.attempts), (Task.PENDING, 1)
+        )
+        self.assertIn('RuntimeError', job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=9))
+        self.run_worker()
+        self.assertEqual(CALLS, [1])
+        for attempt in (2, 3):
+            Task.objects.update(run_at=timezone.now())
+            self.run_worker()
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+        self.assertEqual(job.status, Task.FAILED)
+        self.assertEqual(CALLS, [1, 1, 1])
+
+    def test_abandoned_task_is_claimed_again(self):
+        flaky.delay(1)
+        self.assertEqual(len(claim(10)), 1)
+        self.assertEqual(claim(10), [])
+        Task.objects.update(locked_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(len(claim(10)), 1)
+
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        with self.assertRaises(RuntimeError):
+            flaky.delay(2)
+        self.assertEqual(CALLS, [2])
+        self.assertFalse(Task.objects.exists())
@@ -6,6 +6,8 @@ from django.contrib.auth.views import (
 )
 from django.urls import path
 
+from core.ratelimit import ratelimit
+
 from . import views
 
 app_name = 'users'
@@ -14,9 +16,14 @@ app_name = 'users'
 urlpatterns = [
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        ratelimit('login')(
+            LoginView.as_view(template_name='users/login.html')
+        ),
         name='login'),
-    path('signup/', views.SignUp.as_view(), name='signup'),
+    path(
+        'signup/',
+        ratelimit('signup')(views.SignUp.as_view()),
+        name='signup'),
     path(
         'logout/',
         LogoutView.as_view(template_name='users/logged_out.html'),
@@ -37,9 +44,9 @@ urlpatterns = [
     ),
     path(
         'password_reset/',
-        PasswordResetView.as_view(
+        ratelimit('password_reset')(PasswordResetView.as_view(
             template_name='users/password_reset_form.html'
-        ),
+        )),
         name='password_reset'
     ),
     path(
@@ -1,17 +1,33 @@
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-SECRET_KEY = '=!rn6%9fl#9a*oteieea$nyf#2ndcem*7pnf@+0*z*$1o=_^5p'
+# Профиль настроек: 'development' (по умолчанию) или 'production'.
+# Продакшен выключает DEBUG, держит соединения с базой открытыми,
+# включает WAL у SQLite и кеширует скомпилированные шаблоны; что из
+# этого действует, показывает команда perf_check.
+PROFILE = os.getenv('YATUBE_PROFILE', 'development')
+PRODUCTION = PROFILE == 'production'
+
+# Ключ из репозитория годится только для разработки: в продакшене с ним
+# можно подделать сессии и токены сброса пароля.
+DEVELOPMENT_SECRET_KEY = '=!rn6%9fl#9a*oteieea$nyf#2ndcem*7pnf@+0*z*$1o=_^5p'
+SECRET_KEY = os.getenv('YATUBE_SECRET_KEY', DEVELOPMENT_SECRET_KEY)
+if PRODUCTION and SECRET_KEY == DEVELOPMENT_SECRET_KEY:
+    raise ImproperlyConfigured(
+        'В профиле production задайте YATUBE_SECRET_KEY.'
+    )
 
-DEBUG = True
+DEBUG = not PRODUCTION
 
 ALLOWED_HOSTS = [
     'localhost',
     '127.0.0.1',
     '[::1]',
     'testserver',
-]
+] + list(filter(None, os.getenv('YATUBE_ALLOWED_HOSTS', '').split(',')))
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
@@ -20,6 +36,9 @@ INSTALLED_APPS = [
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
+    'tasks.apps.TasksConfig',
+    'outbox.apps.OutboxConfig',
+    'api.apps.ApiConfig',
     'about.apps.AboutConfig',
     'django.contrib.admin',
     'django.contrib.auth',
@@ -30,11 +49,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaMiddleware',
+    'core.middleware.HashingBusyMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -59,14 +82,139 @@ TEMPLATES = [
     },
 ]
 
+if PRODUCTION:
+    # Шаблоны читаются и компилируются один раз на процесс.
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+    },
+    # Любой Redis-совместимый сервер.
+    'redis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.getenv('YATUBE_REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    },
+    # Тот же django-redis, но вместо сервера fakeredis в памяти процесса:
+    # для разработки и тестов без Redis.
+    'fakeredis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://fakeredis:6379/1',
+        'OPTIONS': {
+            'CONNECTION_POOL_CLASS':
+                'core.cache_backends.FakeRedisConnectionPool',
+        },
+    },
+}
+
+CACHES = {
+    'default': CACHE_BACKENDS[os.getenv('YATUBE_CACHE', 'locmem')],
+}
+
+# Сколько секунд соединение с базой живёт между запросами; 0 —
+# новое соединение на каждый запрос.
+CONN_MAX_AGE = int(
+    os.getenv('YATUBE_CONN_MAX_AGE', '600' if PRODUCTION else '0')
+)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3')
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+    }
+}
+
+# PRAGMA для каждого нового соединения с SQLite, см. core/db.py.
+# WAL не блокирует читателей на время записи, а synchronous=NORMAL
+# в режиме WAL не теряет целостность при сбое процесса.
+SQLITE_PRAGMAS = {}
+if PRODUCTION:
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'busy_timeout': 5000,
+        'cache_size': -20000,
+        'temp_store': 'memory',
+        'mmap_size': 256 * 1024 * 1024,
+    }
+
+# Реплики только для чтения: YATUBE_DB_REPLICAS=/a.sqlite3,/b.sqlite3.
+# Локально файлы заполняются командой sync_replicas.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('YATUBE_DB_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica_{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# View, которые читают с реплик, и сколько секунд после записи
+# пользователь читает только с основной базы.
+REPLICA_VIEWS = {
+    'posts:index',
+    'posts:group_posts',
+    'posts:profile',
+    'posts:post_detail',
+    'posts:group_archive',
+    'posts:profile_archive',
+    'about:author',
+    'about:tech',
+}
+REPLICA_STICKY_SECONDS = 30
+
+# Хешер новых паролей (core.hashers): pbkdf2, scrypt или argon2 (нужен
+# пакет argon2-cffi). Остальные хешеры остаются в списке для проверки
+# старых паролей; при входе пароль пересохраняется выбранным хешером с
+# текущими параметрами. Параметры подбираются командой bench_logins.
+PASSWORD_HASHER_PROFILE = os.getenv('YATUBE_PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'core.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'core.hashers.ScryptPasswordHasher',
+    'argon2': 'core.hashers.Argon2PasswordHasher',
 }
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER_PROFILE],
+    *(
+        path for name, path in PASSWORD_HASHER_CLASSES.items()
+        if name != PASSWORD_HASHER_PROFILE
+    ),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.getenv('YATUBE_PBKDF2_ITERATIONS', '150000')
+)
+PASSWORD_SCRYPT = {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1}
+PASSWORD_ARGON2 = {'time_cost': 2, 'memory_cost': 512, 'parallelism': 2}
+# Пул хеширования: одновременно не больше PASSWORD_HASHING_THREADS
+# хешей и PASSWORD_HASHING_QUEUE ждущих; остальные сразу получают 503.
+# PASSWORD_HASHING_TIMEOUT — секунды ожидания места: всплески уже
+# принимает очередь, а воркер, который ждёт, не отдаёт ленты. 0 потоков
+# — хешировать в потоке запроса.
+PASSWORD_HASHING_THREADS = int(os.getenv(
+    'YATUBE_HASHING_THREADS', max(1, (os.cpu_count() or 2) // 2)
+))
+PASSWORD_HASHING_QUEUE = 4 * PASSWORD_HASHING_THREADS
+PASSWORD_HASHING_TIMEOUT = 0.02
+PASSWORD_HASHING_RETRY_AFTER = 10
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -97,14 +245,131 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
+# Сюда собирает статику команда build_static.
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+# В продакшене имена файлов содержат хеш содержимого, рядом лежат
+# сжатые копии, а отдаёт их StaticFilesMiddleware; хешированные файлы
+# кешируются браузером навсегда, остальные — STATICFILES_MAX_AGE секунд.
+if PRODUCTION:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+STATICFILES_SERVE = PRODUCTION
+STATICFILES_MAX_AGE = 60 * 60
+
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма сначала попадают в таблицу исходящих (приложение outbox),
+# а настоящая отправка идёт пачками через OUTBOX_DELIVERY_BACKEND.
+EMAIL_BACKEND = 'outbox.backends.OutboxEmailBackend'
+
+OUTBOX_DELIVERY_BACKEND = os.getenv(
+    'YATUBE_EMAIL_BACKEND',
+    'django.core.mail.backends.filebased.EmailBackend'
+)
+EMAIL_HOST = os.getenv('YATUBE_EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.getenv('YATUBE_EMAIL_PORT', '25'))
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+# Через сколько секунд письмо в отправке считается брошенным упавшим
+# воркером и снова попадает в очередь.
+OUTBOX_LEASE = 10 * 60
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# 'page' — классическая постраничка по номеру, 'cursor' — по ключу
+# (pub_date, id) без COUNT(*); `?cursor=` включает её для одного запроса.
+POSTS_PAGINATION = 'page'
+
+# Записей на странице ленты: по умолчанию и для отдельных view
+# ('index', 'group', 'profile', 'follow', 'search', 'archive').
+# `?per_page=` меняет размер для запроса, но не больше
+# POSTS_MAX_PAGE_SIZE (у архива — POSTS_ARCHIVE_MAX_PAGE_SIZE).
+POSTS_PAGE_SIZE = 10
+POSTS_PAGE_SIZES = {'archive': 500}
+POSTS_MAX_PAGE_SIZE = 100
+POSTS_ARCHIVE_MAX_PAGE_SIZE = 2000
+# Сколько символов текста показывать в архиве вместо полной записи.
+POSTS_ARCHIVE_SNIPPET = 100
+
+# Потоковая отрисовка лент (posts/streaming.py): шапка страницы уходит
+# сразу, записи — порциями по POSTS_STREAM_CHUNK_SIZE. `?stream=1`
+# включает её для одного запроса.
+POSTS_STREAMING = False
+POSTS_STREAM_CHUNK_SIZE = 50
+
+# Новые записи раскладываются по лентам подписчиков, пока у автора
+# их не больше POSTS_FANOUT_LIMIT; записи популярных авторов
+# подмешиваются в ленту /follow/ при чтении.
+POSTS_FANOUT_LIMIT = 1000
+POSTS_FANOUT_BATCH_SIZE = 500
+# Сколько последних записей автора попадает в ленту при подписке.
+POSTS_TIMELINE_BACKFILL = 100
+
+# Миниатюры картинок записей: размер -> (геометрия sorl, параметры).
+# Делаются воркером сразу после загрузки, см. posts/thumbnails.py.
+POSTS_THUMBNAIL_SIZES = {
+    'feed': ('960x339', {'crop': 'center', 'upscale': True}),
+    'detail': ('960', {'upscale': False}),
+}
+
+# Сколько самых активных авторов показывать в каталоге групп.
+POSTS_GROUP_TOP_AUTHORS = 3
+
+# Кеш страниц лент для анонимных посетителей, 0 — выключен.
+POSTS_FEED_CACHE = 'default'
+POSTS_FEED_CACHE_TIMEOUT = 60
+# Сколько секунд браузеры и прокси могут хранить анонимные страницы
+# лент без проверки ETag.
+POSTS_HTTP_MAX_AGE = 60
+# Карточки записей кешируются по id и дате изменения записи.
+POSTS_CARD_CACHE_TIMEOUT = 60 * 60
+
+# JSON API /api/v1/: размер страницы по умолчанию и предел `?limit=`.
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+# Ограничение частоты запросов (core.ratelimit): область -> (сколько
+# запросов можно сделать подряд, за сколько секунд лимит
+# восстанавливается полностью). Счётчики — на /ratelimit/.
+RATELIMIT_ENABLED = True
+# 'cache' — корзины в кеше (общие для процессов при Redis), 'memory' —
+# в памяти процесса.
+RATELIMIT_STORAGE = os.getenv('YATUBE_RATELIMIT_STORAGE', 'cache')
+# Откуда брать IP анонимного клиента; за nginx — 'HTTP_X_REAL_IP'.
+RATELIMIT_IP_HEADER = os.getenv('YATUBE_RATELIMIT_IP_HEADER', 'REMOTE_ADDR')
+RATELIMIT_MEMORY_KEYS = 10000
+RATELIMITS = {
+    'post_create': (10, 10 * 60),
+    'post_edit': (30, 10 * 60),
+    'signup': (5, 60 * 60),
+    'login': (10, 5 * 60),
+    'password_reset': (3, 60 * 60),
+}
+
+# Замеры SQL и шаблонов в заголовке Server-Timing и на /profiling/.
+PROFILING = os.getenv('YATUBE_PROFILING') == '1'
+# Доля запросов, для которых cProfile пишет .prof в PROFILING_DIR.
+PROFILING_SAMPLE_RATE = float(os.getenv('YATUBE_PROFILING_SAMPLE', '0'))
+PROFILING_DIR = os.path.join(BASE_DIR, 'profiles')
+PROFILING_HISTORY = 500
+
+# Очередь фоновых задач (приложение tasks, воркер run_tasks).
+# С TASKS_ALWAYS_EAGER задачи выполняются сразу при постановке.
+TASKS_ALWAYS_EAGER = os.getenv('YATUBE_TASKS_EAGER') == '1'
+TASKS_PROCESSES = os.cpu_count() or 1
+TASKS_MAX_ATTEMPTS = 5
+# Пауза перед повтором удваивается с каждой попыткой, секунды.
+TASKS_RETRY_DELAY = 10
+TASKS_RETRY_MAX = 60 * 60
+# Через сколько секунд задача в работе считается брошенной.
+TASKS_LEASE = 10 * 60
+# Периодические задачи: имя -> пауза в секундах между запусками.
+TASKS_PERIODIC = {
+    'posts.jobs.refresh_group_stats': 10 * 60,
+}
@@ -1,11 +1,24 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from core.views import feed_cache_stats, profiling_stats, ratelimit_stats
+
 
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
+    path('api/v1/', include('api.urls', namespace='api')),
     path('about/', include('about.urls', namespace='about')),
+    path('profiling/', profiling_stats, name='profiling_stats'),
+    path('ratelimit/', ratelimit_stats, name='ratelimit_stats'),
+    path('feed-cache/', feed_cache_stats, name='feed_cache_stats'),
 ]
+
+if settings.DEBUG:
+    urlpatterns += static(
+        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
+    )
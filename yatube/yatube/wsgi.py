@@ -6,3 +6,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+# Шаблоны компилируются до первого запроса, а не во время него.
+from core.warmup import warm_up  # noqa: E402
+
+warm_up()